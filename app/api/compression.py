@@ -0,0 +1,68 @@
+import gzip
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+from app.config import COMPRESSION_LEVELS
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+def _compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    # In order of preference when a client accepts several encodings equally
+    compressors = {}
+    if brotli is not None:
+        compressors["br"] = lambda body: brotli.compress(body, quality=COMPRESSION_LEVELS["br"])
+    if zstandard is not None:
+        compressors["zstd"] = lambda body: zstandard.ZstdCompressor(level=COMPRESSION_LEVELS["zstd"]).compress(body)
+    # mtime=0 keeps the output identical for identical bodies
+    compressors["gzip"] = lambda body: gzip.compress(body, compresslevel=COMPRESSION_LEVELS["gzip"], mtime=0)
+    return compressors
+
+COMPRESSORS = _compressors()
+
+# Content codings this server can produce, best first; brotli and zstd need their optional packages
+ENCODINGS = tuple(COMPRESSORS)
+
+def compress(body: bytes, encoding: str) -> bytes:
+    return COMPRESSORS[encoding](body)
+
+@lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    The preferred available content coding allowed by an Accept-Encoding header value,
+    or None for the identity coding. Codings with q=0 are refused; `*` stands for any
+    coding not listed explicitly.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    # An explicitly preferred identity coding wins over compression
+    if weights.get("identity", 0.0) > best_weight:
+        return None
+    return best
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from app.models import CacheStatsResponse, DataStatusResponse, LoadReportResponse, ReadinessResponse, ReloadStats
+from app.config import STARTUP_RETRY_AFTER
+from app.core import loader
+from app.dependencies import require_admin
+from app.core.refresher import refresher
+from app.api.endpoints.operators import response_cache, attribute_memo, filter_memo, in_flight
+from app.db.repository import db
+
+router = APIRouter()
+
+# Everything under /admin needs the admin token; readiness stays open for probes
+ADMIN_ONLY = [Depends(require_admin)]
+
+@router.get("/ready", response_model=ReadinessResponse, operation_id="getReadiness")
+def get_readiness():
+    """`ready` or `degraded` (serving on-disk data while fresh data loads) answer 200; `loading` answers 503."""
+    content = {"status": refresher.status, "version": db.version}
+    if content["status"] == "loading":
+        return JSONResponse(status_code=503, content=content, headers={"Retry-After": str(STARTUP_RETRY_AFTER)})
+    return content
+
+@router.get("/admin/data", response_model=DataStatusResponse, operation_id="getDataStatus", dependencies=ADMIN_ONLY)
+def get_data_status():
+    return {
+        "version": db.version,
+        "operators": len(db.get_all()),
+        "lastReload": refresher.last_reload,
+    }
+
+@router.get("/admin/load-report", response_model=LoadReportResponse, response_model_exclude_none=True, operation_id="getLoadReport", dependencies=ADMIN_ONLY)
+def get_load_report():
+    """
+    Per-stage wall and CPU time, bytes read, traced memory and processed items of the last
+    data load that did not stop early for unchanged sources. Memory figures are only present
+    for reloads traced with tracemalloc.
+    """
+    if loader.last_load_report is None:
+        raise HTTPException(status_code=404, detail="No data load has been measured yet.")
+    return loader.last_load_report.to_dict()
+
+@router.get("/admin/caches", response_model=CacheStatsResponse, response_model_exclude_none=True, operation_id="getCacheStats", dependencies=ADMIN_ONLY)
+def get_cache_stats():
+    """
+    Hit, miss and eviction counters of the response cache and the attribute and filter memos,
+    and how many requests were coalesced into a computation already in flight.
+    """
+    return {
+        "responses": response_cache.stats(),
+        "attributes": attribute_memo.stats(),
+        "filters": filter_memo.stats(),
+        "coalescing": in_flight.stats(),
+    }
+
+@router.post("/admin/reload", response_model=ReloadStats, operation_id="reloadData", dependencies=ADMIN_ONLY)
+def reload_data(
+    download: bool = Query(False, title="重新下载", description="忽略缓存有效期，强制检查远程数据更新"),
+    wait: bool = Query(True, title="等待完成", description="为 false 时仅在后台触发重建并立即返回 202")
+):
+    if not wait:
+        refresher.trigger(force_download=download)
+        return JSONResponse(status_code=202, content={"detail": "Reload triggered."})
+    return refresher.reload(force_download=download)
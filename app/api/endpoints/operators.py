@@ -1,100 +1,473 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from dataclasses import astuple, fields as dataclass_fields
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import create_model
 from app.models import (
-    Operator, 
-    OperatorBase, 
-    OperatorAttributesResponse, 
-    OperatorSkillsResponse, 
-    OperatorModulesResponse
+    Operator,
+    OperatorBase,
+    OperatorAttributesResponse,
+    OperatorSkillsResponse,
+    OperatorModulesResponse,
+    AttributesBatchRequest,
+    AttributesBatchResult
 )
-from app.dependencies import FilterParams, CalculationParams
+from app.config import (
+    BATCH_ATTRIBUTES_THRESHOLD, RESPONSE_CACHE_MAX_BYTES, NDJSON_CHUNK_SIZE,
+    ATTRIBUTE_MEMO_MAX_ENTRIES, FILTER_MEMO_MAX_ENTRIES, COMPRESSION_MIN_BYTES
+)
+from app.dependencies import FilterParams, CalculationParams, PageParams, ProjectionParams, SortParams, require_data
+from app.core.cache import MISSING, CachedResponse, MemoCache, ResponseCache, SingleFlight, etag_matches
+from app.core.details import DETAIL_FIELDS, materialize, with_details
 from app.core.logic import calculate_attributes, validate_calculation_params
-from app.db.repository import db
+from app.api.compression import ENCODINGS, compress, negotiate_encoding
+from app.api.serialization import JSONRenderer
+from app.db.index import SORT_FIELDS, ATTRIBUTE_SORT_FIELDS
+from app.db.repository import db, RepositorySnapshot
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(require_data)])
 
-@router.get("/operators", response_model=List[Operator], operation_id="searchOperators")
-def search_operators(
-    filters: FilterParams = Depends(),
-    calc: CalculationParams = Depends()
-):
-    results = db.filter_operators(
-        char_id=filters.char_id,
-        name=filters.name, profession=filters.profession, sub_profession=filters.sub_profession,
-        rarity=filters.rarity, position=filters.position, tags=[filters.tag] if filters.tag else None,
-        nation=filters.nation, gender=filters.gender, birth_place=filters.birth_place,
-        race=filters.race, obtain_approach=filters.obtain_approach
-    )
-    
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES)
+# Coalesces concurrent identical cache misses (and compressions) into one computation
+in_flight = SingleFlight()
+attribute_memo = MemoCache(ATTRIBUTE_MEMO_MAX_ENTRIES)
+filter_memo = MemoCache(FILTER_MEMO_MAX_ENTRIES)
+
+RENDERERS = {
+    "searchOperators": JSONRenderer(List[Operator]),
+    "getOperatorsBasic": JSONRenderer(List[OperatorBase]),
+    "getOperatorsAttributes": JSONRenderer(List[OperatorAttributesResponse]),
+    "getOperatorsSkills": JSONRenderer(List[OperatorSkillsResponse]),
+    "getOperatorsModules": JSONRenderer(List[OperatorModulesResponse]),
+    "getOperatorsAttributesBatch": JSONRenderer(List[AttributesBatchResult]),
+}
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+OPERATOR_FIELDS = tuple(Operator.model_fields)
+
+def _cached_response(
+    request: Request,
+    snapshot: RepositorySnapshot,
+    operation_id: str,
+    params: tuple,
+    build: Callable[[], Any],
+    renderer: Optional[JSONRenderer] = None,
+    extra_headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serves the JSON body for (operation, params, data version) from the response cache,
+    building and rendering it from `snapshot` on a miss; concurrent misses for the same key
+    wait for a single build. The body is sent compressed with the best encoding the client
+    accepts, compressing it once per entry and encoding. Answers a matching If-None-Match with 304.
+    `extra_headers` may be filled in by `build`; they are cached along with the body.
+    """
+    key = (operation_id, params, snapshot.version)
+    entry = response_cache.get(key)
+    if entry is None:
+        def render():
+            # A flight that finished just before this one started may have filled the cache
+            cached = response_cache.peek(key)
+            if cached is not None:
+                return cached
+            body = (renderer or RENDERERS[operation_id]).render(build())
+            return response_cache.put(key, body, snapshot.version, extra_headers)
+        entry = in_flight.do(key, render)
+
+    body, etag = entry.body, entry.etag
+    encoding = negotiate_encoding(request.headers.get("accept-encoding")) if len(body) >= COMPRESSION_MIN_BYTES else None
+    if encoding is not None:
+        body = entry.variants.get(encoding)
+        if body is None:
+            # The flight may have compressed another entry of the same key (one rebuilt after an
+            # eviction, or one too large to be cached), so use its result, not `entry.variants`
+            body = in_flight.do((key, encoding), lambda: _add_variant(key, entry, encoding))
+        # Each encoding is a different representation, so it gets its own strong ETag
+        etag = f'{etag[:-1]}-{encoding}"'
+
+    headers = {"ETag": etag, "X-Data-Version": str(snapshot.version), "Vary": "Accept-Encoding", **entry.headers}
+    # Only the ETag of the representation being served validates; a 304 carries no Content-Encoding,
+    # since caches copy its headers onto the response they stored
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _add_variant(key: tuple, entry: CachedResponse, encoding: str) -> bytes:
+    """`entry`'s body compressed with `encoding`, compressed once and kept on the entry."""
+    body = entry.variants.get(encoding)
+    if body is None:
+        body = compress(entry.body, encoding)
+        response_cache.add_variant(key, entry, encoding, body)
+    return body
+
+def _calc_key(calc: CalculationParams) -> tuple:
+    return _settings_key(calc.elite, calc.level, calc.trust, calc.potential)
+
+def _settings_key(elite: Optional[int], level: Optional[int], trust: Optional[int], potential: Optional[int]) -> tuple:
+    # Trust above 100 gives no extra bonus, so it shares the cache entry of 100
+    trust = max(0, min(trust, 100)) if trust is not None else None
+    return (elite, level, potential, trust)
+
+# _calc_key of the CalculationParams defaults, which the precomputed attribute sort keys use
+DEFAULT_CALC_KEY = (None, None, 5, 100)
+
+# Range filter parameter prefixes (`<prefix>_min` / `<prefix>_max`) and the attributes they bound
+ATTRIBUTE_RANGE_PARAMS = {
+    "max_hp": "maxHp", "atk": "atk", "def": "def", "magic_resistance": "magicResistance",
+    "cost": "cost", "block_cnt": "blockCnt", "respawn_time": "respawnTime", "attack_speed": "attackSpeed",
+}
+
+def _attribute_ranges(filters: FilterParams) -> dict:
+    ranges = {}
+    for prefix, field in ATTRIBUTE_RANGE_PARAMS.items():
+        low, high = getattr(filters, f"{prefix}_min"), getattr(filters, f"{prefix}_max")
+        if low is not None or high is not None:
+            ranges[field] = (low, high)
+    return ranges
+
+FILTER_FIELDS = tuple(field.name for field in dataclass_fields(FilterParams))
+
+def _filter_key(filters: FilterParams) -> tuple:
+    """
+    Normalized, hashable form of the filters for cache keys. Multi-valued filters arrive as
+    lists in request order, but match as sets; names match case-insensitively.
+    """
+    key = []
+    for field in FILTER_FIELDS:
+        value = getattr(filters, field)
+        if isinstance(value, list):
+            value = tuple(sorted(set(value)))
+        elif field == "name" and value:
+            value = value.lower()
+        key.append(value)
+    return tuple(key)
+
+def _parse_sort(sort: SortParams) -> Optional[Tuple[Tuple[str, bool], ...]]:
+    """Returns (field, descending) pairs for the requested sort keys, or None when unsorted."""
+    if not sort.sort:
+        return None
+    available = SORT_FIELDS + ATTRIBUTE_SORT_FIELDS
+    order = []
+    for key in sort.sort.split(","):
+        key = key.strip()
+        if not key:
+            continue
+        descending = key.startswith("-")
+        field = key.lstrip("+-")
+        # A bare sign ("sort=-", a trailing ",-") names no field
+        if not field:
+            continue
+        if field not in available:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot sort by '{field}'. Available sort keys: {', '.join(available)}."
+            )
+        order.append((field, descending))
+    return tuple(order) or None
+
+def _sort_operators(
+    snapshot: RepositorySnapshot,
+    results: List[dict],
+    order: Optional[tuple],
+    calc: Optional[CalculationParams] = None,
+    count: Optional[int] = None
+) -> List[dict]:
+    """Sorts `results` by `order`, keeping only the first `count` when given."""
+    if not order:
+        return results
+    values = None
+    attribute_fields = [field for field, _ in order if field in ATTRIBUTE_SORT_FIELDS]
+    # The precomputed attribute ranks hold for the default settings only
+    if attribute_fields and calc is not None and _calc_key(calc) != DEFAULT_CALC_KEY:
+        stats = snapshot.attribute_engine.calculate(results, calc.elite, calc.level, calc.trust, calc.potential)
+        values = {field: [s[field] if s else None for s in stats] for field in attribute_fields}
+    return snapshot.sort_index.sort(results, order, count, values)
+
+def _filter_operators(
+    snapshot: RepositorySnapshot,
+    filters: FilterParams,
+    details: tuple = (),
+    order: Optional[tuple] = None,
+    calc: Optional[CalculationParams] = None,
+    keep_details: bool = True
+) -> List[dict]:
+    """
+    Filters (and sorts) the snapshot's operators and materializes the `details` fields the response
+    needs. Without `keep_details`, they are built onto copies instead of being memoized on the records.
+    """
+    key = _filter_key(filters)
+    matched = filter_memo.get(snapshot.version, key)
+    if matched is MISSING:
+        matched = tuple(snapshot.filter_operators(
+            char_id=filters.char_id,
+            name=filters.name, profession=filters.profession, sub_profession=filters.sub_profession,
+            rarity=filters.rarity, position=filters.position, tags=filters.tag,
+            nation=filters.nation, gender=filters.gender, birth_place=filters.birth_place,
+            race=filters.race, obtain_approach=filters.obtain_approach,
+            attribute_ranges=_attribute_ranges(filters)
+        ))
+        filter_memo.put(snapshot.version, key, matched)
+
+    results = _sort_operators(snapshot, list(matched), order, calc)
+    if details:
+        attach = materialize if keep_details else with_details
+        results = [attach(op, details) for op in results]
+    return results
+
+def _calculate_all_attributes(snapshot: RepositorySnapshot, results: List[dict], calc: CalculationParams) -> list:
+    return _memoized_attributes(snapshot, results, [(calc.elite, calc.level, calc.trust, calc.potential)] * len(results))
+
+def _memoized_attributes(snapshot: RepositorySnapshot, operators: List[dict], params: list) -> list:
+    """
+    Attributes for each operator at its (elite, level, trust, potential), served from the
+    attribute memo where possible; the rest are computed together and memoized.
+    """
+    keys = [(op["charId"],) + _settings_key(*settings) for op, settings in zip(operators, params)]
+    attributes = attribute_memo.get_many(snapshot.version, keys)
+    missing = [i for i, value in enumerate(attributes) if value is MISSING]
+    if not missing:
+        return attributes
+
+    pending = [operators[i] for i in missing]
+    pending_params = [params[i] for i in missing]
+    # Large sets are computed in one vectorized pass
+    if len(pending) > BATCH_ATTRIBUTES_THRESHOLD:
+        computed = snapshot.attribute_engine.calculate_each(pending, pending_params)
+    else:
+        computed = [calculate_attributes(op, *settings) for op, settings in zip(pending, pending_params)]
+    for i, value in zip(missing, computed):
+        attributes[i] = value
+    attribute_memo.put_many(snapshot.version, [(keys[i], value) for i, value in zip(missing, computed)])
+    return attributes
+
+def _parse_fields(projection: ProjectionParams) -> Optional[Tuple[str, ...]]:
+    """Returns the requested Operator fields in model order, or None for all of them."""
+    if not projection.fields:
+        return None
+    requested = {name.strip() for name in projection.fields.split(",") if name.strip()}
+    unknown = requested - set(OPERATOR_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Available fields: {', '.join(OPERATOR_FIELDS)}."
+        )
+    return tuple(name for name in OPERATOR_FIELDS if name in requested)
+
+@lru_cache(maxsize=64)
+def _projection_model(fields: Tuple[str, ...]):
+    # Same field definitions as Operator, so projected fields serialize exactly alike
+    return create_model("OperatorProjection", **{name: (Operator.model_fields[name].annotation, Operator.model_fields[name]) for name in fields})
+
+@lru_cache(maxsize=64)
+def _operator_renderer(fields: Optional[Tuple[str, ...]], many: bool) -> JSONRenderer:
+    model = Operator if fields is None else _projection_model(fields)
+    return JSONRenderer(List[model] if many else model)
+
+def _paginate(results: List[dict], page: PageParams) -> List[dict]:
+    if page.limit is None:
+        return results[page.offset:] if page.offset else results
+    return results[page.offset:page.offset + page.limit]
+
+def _operator_rows(
+    snapshot: RepositorySnapshot,
+    operators: List[dict],
+    calc: CalculationParams,
+    fields: Optional[Tuple[str, ...]],
+    keep_details: bool = True
+) -> list:
+    """Full operator rows for `operators`, computing only the parts selected by `fields`."""
+    wanted = OPERATOR_FIELDS if fields is None else fields
+    details = tuple(name for name in DETAIL_FIELDS if name in wanted)
+    attach = materialize if keep_details else with_details
+    if "attributes" not in wanted:
+        return [attach(op, details) for op in operators]
+
+    rows = []
+    for op, attributes in zip(operators, _calculate_all_attributes(snapshot, operators, calc)):
+        row = attach(op, details).copy()
+        row["attributes"] = attributes
+        rows.append(row)
+    return rows
+
+def _stream_operators(snapshot: RepositorySnapshot, operators: List[dict], calc: CalculationParams, fields: Optional[Tuple[str, ...]]) -> Iterator[bytes]:
+    # One chunk at a time, so memory stays flat and the first lines go out right away
+    renderer = _operator_renderer(fields, False)
+    for start in range(0, len(operators), NDJSON_CHUNK_SIZE):
+        rows = _operator_rows(snapshot, operators[start:start + NDJSON_CHUNK_SIZE], calc, fields)
+        yield b"".join(renderer.render(row) + b"\n" for row in rows)
+
+def _wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+def _validate_single_result(results: List[dict], calc: CalculationParams):
     if len(results) == 1:
         try:
             validate_calculation_params(results[0], calc.elite, calc.level, calc.potential)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
 
-    final_results = []
-    for op in results:
-        op_copy = op.copy()
-        op_copy["attributes"] = calculate_attributes(op, calc.elite, calc.level, calc.trust, calc.potential)
-        final_results.append(op_copy)
+@router.get(
+    "/operators",
+    response_model=List[Operator],
+    operation_id="searchOperators",
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "With `Accept: application/x-ndjson`, one operator per line, streamed."}}
+)
+def search_operators(
+    request: Request,
+    filters: FilterParams = Depends(),
+    calc: CalculationParams = Depends(),
+    sort: SortParams = Depends(),
+    page: PageParams = Depends(),
+    projection: ProjectionParams = Depends()
+):
+    snapshot = db.snapshot()
+    fields = _parse_fields(projection)
+    order = _parse_sort(sort)
+
+    if _wants_ndjson(request):
+        results, total = _search_page(snapshot, filters, calc, order, page)
+        return StreamingResponse(
+            _stream_operators(snapshot, results, calc, fields),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"X-Data-Version": str(snapshot.version), "X-Total-Count": str(total)}
+        )
+    return _search_response(request, snapshot, filters, calc, order, page, fields)
 
-    return final_results
+def _search_response(
+    request: Request,
+    snapshot: RepositorySnapshot,
+    filters: FilterParams,
+    calc: CalculationParams,
+    order: Optional[tuple],
+    page: PageParams,
+    fields: Optional[Tuple[str, ...]],
+    keep_details: bool = True
+) -> Response:
+    extra_headers = {}
 
-@router.get("/operators/basic", response_model=List[OperatorBase], operation_id="getOperatorsBasic")
-def get_operators_basic(filters: FilterParams = Depends()):
-    return db.filter_operators(
-        char_id=filters.char_id,
-        name=filters.name, profession=filters.profession, sub_profession=filters.sub_profession,
-        rarity=filters.rarity, position=filters.position, tags=[filters.tag] if filters.tag else None,
-        nation=filters.nation, gender=filters.gender, birth_place=filters.birth_place,
-        race=filters.race, obtain_approach=filters.obtain_approach
+    def build():
+        results, total = _search_page(snapshot, filters, calc, order, page)
+        extra_headers["X-Total-Count"] = str(total)
+        return _operator_rows(snapshot, results, calc, fields, keep_details)
+
+    # Calculation parameters stay in the key even when no attributes are returned: they are
+    # validated against a single matching operator, which can answer 400
+    return _cached_response(
+        request, snapshot, "searchOperators", (_filter_key(filters), _calc_key(calc), order, astuple(page), fields), build,
+        renderer=_operator_renderer(fields, True), extra_headers=extra_headers
     )
 
+def _search_page(snapshot: RepositorySnapshot, filters: FilterParams, calc: CalculationParams, order: Optional[tuple], page: PageParams) -> Tuple[List[dict], int]:
+    """The requested page of matching operators, and the total number of matches."""
+    results = _filter_operators(snapshot, filters)
+    _validate_single_result(results, calc)
+    # A page of a sorted result only needs its first offset + limit operators in order
+    count = page.offset + page.limit if page.limit is not None else None
+    return _paginate(_sort_operators(snapshot, results, order, calc, count), page), len(results)
+
+@router.get("/operators/basic", response_model=List[OperatorBase], operation_id="getOperatorsBasic")
+def get_operators_basic(request: Request, filters: FilterParams = Depends(), sort: SortParams = Depends()):
+    return _details_response(request, db.snapshot(), "getOperatorsBasic", filters, _parse_sort(sort), ("modules",))
+
 @router.get("/operators/attributes", response_model=List[OperatorAttributesResponse], operation_id="getOperatorsAttributes")
 def get_operators_attributes(
+    request: Request,
     filters: FilterParams = Depends(),
-    calc: CalculationParams = Depends()
+    calc: CalculationParams = Depends(),
+    sort: SortParams = Depends()
 ):
-    results = db.filter_operators(
-        char_id=filters.char_id,
-        name=filters.name, profession=filters.profession, sub_profession=filters.sub_profession,
-        rarity=filters.rarity, position=filters.position, tags=[filters.tag] if filters.tag else None,
-        nation=filters.nation, gender=filters.gender, birth_place=filters.birth_place,
-        race=filters.race, obtain_approach=filters.obtain_approach
-    )
-    
-    if len(results) == 1:
+    snapshot = db.snapshot()
+    order = _parse_sort(sort)
+
+    def build():
+        results = _filter_operators(snapshot, filters, order=order, calc=calc)
+        _validate_single_result(results, calc)
+
+        final_results = []
+        for op, attributes in zip(results, _calculate_all_attributes(snapshot, results, calc)):
+            final_results.append({
+                "charId": op["charId"],
+                "name": op["name"],
+                "attributes": attributes
+            })
+        return final_results
+
+    return _cached_response(request, snapshot, "getOperatorsAttributes", (_filter_key(filters), _calc_key(calc), order), build)
+
+@router.post("/operators/attributes/batch", response_model=List[AttributesBatchResult], operation_id="getOperatorsAttributesBatch")
+def get_operators_attributes_batch(body: AttributesBatchRequest):
+    """
+    Attributes for many operators in one request, each with its own calculation parameters.
+    Results follow the order of `items`; an item that cannot be computed carries an `error` instead.
+    """
+    snapshot = db.snapshot()
+    results = []
+    pending = []
+    for item in body.items:
+        op = snapshot.by_char_id.get(item.charId)
+        if op is None:
+            results.append({"charId": item.charId, "error": f"Operator '{item.charId}' not found."})
+            continue
+        result = {"charId": item.charId, "name": op["name"]}
         try:
-            validate_calculation_params(results[0], calc.elite, calc.level, calc.potential)
+            validate_calculation_params(op, item.elite, item.level, item.potential)
         except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+            result["error"] = str(e)
+        else:
+            pending.append((result, op, (item.elite, item.level, item.trust, item.potential)))
+        results.append(result)
 
-    final_results = []
-    for op in results:
-        attributes = calculate_attributes(op, calc.elite, calc.level, calc.trust, calc.potential)
-        final_results.append({
-            "charId": op["charId"],
-            "name": op["name"],
-            "attributes": attributes
-        })
-    return final_results
+    computed = _memoized_attributes(snapshot, [op for _, op, _ in pending], [settings for _, _, settings in pending])
+    for (result, _, _), attributes in zip(pending, computed):
+        result["attributes"] = attributes
+
+    content = RENDERERS["getOperatorsAttributesBatch"].render(results)
+    return Response(content=content, media_type="application/json", headers={"X-Data-Version": str(snapshot.version)})
 
 @router.get("/operators/skills", response_model=List[OperatorSkillsResponse], operation_id="getOperatorsSkills")
-def get_operators_skills(filters: FilterParams = Depends()):
-    return db.filter_operators(
-        char_id=filters.char_id,
-        name=filters.name, profession=filters.profession, sub_profession=filters.sub_profession,
-        rarity=filters.rarity, position=filters.position, tags=[filters.tag] if filters.tag else None,
-        nation=filters.nation, gender=filters.gender, birth_place=filters.birth_place,
-        race=filters.race, obtain_approach=filters.obtain_approach
-    )
+def get_operators_skills(request: Request, filters: FilterParams = Depends(), sort: SortParams = Depends()):
+    return _details_response(request, db.snapshot(), "getOperatorsSkills", filters, _parse_sort(sort), ("skills",))
 
 @router.get("/operators/modules", response_model=List[OperatorModulesResponse], operation_id="getOperatorsModules")
-def get_operators_modules(filters: FilterParams = Depends()):
-    return db.filter_operators(
-        char_id=filters.char_id,
-        name=filters.name, profession=filters.profession, sub_profession=filters.sub_profession,
-        rarity=filters.rarity, position=filters.position, tags=[filters.tag] if filters.tag else None,
-        nation=filters.nation, gender=filters.gender, birth_place=filters.birth_place,
-        race=filters.race, obtain_approach=filters.obtain_approach
+def get_operators_modules(request: Request, filters: FilterParams = Depends(), sort: SortParams = Depends()):
+    return _details_response(request, db.snapshot(), "getOperatorsModules", filters, _parse_sort(sort), ("modules",))
+
+def _details_response(
+    request: Request,
+    snapshot: RepositorySnapshot,
+    operation_id: str,
+    filters: FilterParams,
+    order: Optional[tuple],
+    details: tuple,
+    keep_details: bool = True
+) -> Response:
+    """Cached response of the matching operators with their `details` fields."""
+    return _cached_response(
+        request, snapshot, operation_id, (_filter_key(filters), order),
+        lambda: _filter_operators(snapshot, filters, details, order, keep_details=keep_details)
     )
+
+def _query_defaults(params_class):
+    # The dataclass defaults are the Query(...) declarations; FastAPI fills in their own defaults
+    return params_class(**{field.name: field.default.default for field in dataclass_fields(params_class)})
+
+def precompress_full_roster():
+    """
+    Renders the unfiltered, full-roster responses of the current data version and compresses
+    them in every available encoding, so the first clients after a reload hit the cache.
+    Skills and modules are built for the render only, not memoized on the records, so the
+    records stay as light as a load leaves them.
+    """
+    snapshot = db.snapshot()
+    filters, calc = _query_defaults(FilterParams), _query_defaults(CalculationParams)
+    page, fields = _query_defaults(PageParams), _parse_fields(_query_defaults(ProjectionParams))
+    order = _parse_sort(_query_defaults(SortParams))
+    for encoding in ENCODINGS:
+        request = Request({"type": "http", "headers": [(b"accept-encoding", encoding.encode("latin-1"))]})
+        _search_response(request, snapshot, filters, calc, order, page, fields, keep_details=False)
+        _details_response(request, snapshot, "getOperatorsBasic", filters, order, ("modules",), keep_details=False)
+        get_operators_attributes(request, filters, calc, _query_defaults(SortParams))
+        _details_response(request, snapshot, "getOperatorsSkills", filters, order, ("skills",), keep_details=False)
+        _details_response(request, snapshot, "getOperatorsModules", filters, order, ("modules",), keep_details=False)
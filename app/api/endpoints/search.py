@@ -0,0 +1,24 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.models import SearchHit
+from app.dependencies import require_data
+from app.db.repository import db
+from app.db.search import SEARCH_KINDS
+
+router = APIRouter(dependencies=[Depends(require_data)])
+
+@router.get("/search", response_model=List[SearchHit], operation_id="searchTexts")
+def search_texts(
+    q: str = Query(..., title="关键词", min_length=1, description="搜索词, 以空格分隔的多个词需同时出现 (如 眩晕 或 法术伤害 护盾)"),
+    kind: Optional[List[str]] = Query(None, title="类型", description="只搜索这些文本: description (特性), skill, module, potential (可重复)"),
+    limit: int = Query(20, title="数量", ge=1, le=100, description="最多返回的结果数量")
+):
+    """Full-text search over operator descriptions, skills, module upgrades and potentials, best matches first."""
+    if kind:
+        unknown = set(kind) - set(SEARCH_KINDS)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown kinds: {', '.join(sorted(unknown))}. Available kinds: {', '.join(SEARCH_KINDS)}."
+            )
+    return db.snapshot().text_index.search(q, kind, limit)
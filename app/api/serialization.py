@@ -0,0 +1,36 @@
+import json
+import re
+from typing import Any
+from pydantic import TypeAdapter
+
+# pydantic-core writes floats below 1e-4 in decimal form and large ones as e.g. 1e16,
+# where json.dumps writes 1e-05 and 1e+16. Bodies holding such a number are re-encoded
+# with json.dumps; the rare string that looks like one only costs the slower path.
+_FLOAT_NOTATION_DIFFERS = re.compile(rb"[:,\[]-?(?:\d+(?:\.\d+)?e[-+]?\d+|0\.0000\d*)[,\]}]")
+
+class JSONRenderer:
+    """
+    Renders endpoint results to JSON bytes for one response shape, exactly as FastAPI
+    would for a `response_model` (validate, dump by alias, compact JSONResponse encoding).
+    Validation and JSON encoding both run in pydantic-core's compiled schema for the shape,
+    which skips building the intermediate Python objects json.dumps would need.
+    """
+    def __init__(self, response_type: Any):
+        self._adapter = TypeAdapter(response_type)
+
+    def render(self, content: Any) -> bytes:
+        value = self._adapter.validate_python(content, from_attributes=True)
+        body = self._adapter.dump_json(value, by_alias=True)
+        if _FLOAT_NOTATION_DIFFERS.search(body):
+            return self._render_with_json(value)
+        return body
+
+    def _render_with_json(self, value: Any) -> bytes:
+        data = self._adapter.dump_python(value, mode="json", by_alias=True)
+        return json.dumps(
+            data,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
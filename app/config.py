@@ -1,9 +1,56 @@
+import os
 from pathlib import Path
 
 # Configuration
 CACHE_DIR = Path("data_cache")
 REMOTE_BASE_URL = "https://torappu.prts.wiki/gamedata/latest/excel/"
 CACHE_DURATION = 86400  # 24 hours in seconds
+DOWNLOAD_WORKERS = 4  # Concurrent downloads when refreshing the cache
+DOWNLOAD_TIMEOUT = 30  # Seconds per request
+REFRESH_INTERVAL = 3600  # Seconds between background data refresh checks
+# "blocking": load (and download) before serving. "background": start serving right away from
+# the data already on disk and fetch fresh data in the background; 503 until any data is loaded.
+STARTUP_MODE = os.environ.get("STARTUP_MODE", "blocking")
+STARTUP_RETRY_AFTER = 5  # Seconds, sent as Retry-After while no data is loaded
+# Token required by the /api/admin/* endpoints, as `Authorization: Bearer <token>`. While unset,
+# the admin endpoints answer 404, so reloads cannot be forced from the public API.
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN") or None
+TRACE_RELOAD_MEMORY = True  # Measure peak memory of rebuilds with tracemalloc (slows the rebuild down)
+# Same for the startup load (and, with STARTUP_MODE=background, the first fetches); off unless TRACE_STARTUP_MEMORY=1,
+# since tracing several times slows the startup down
+TRACE_STARTUP_MEMORY = os.environ.get("TRACE_STARTUP_MEMORY", "0") == "1"
+VALIDATORS_FILE = "validators.json"  # ETag / Last-Modified of each cached file, for conditional requests
+SNAPSHOT_PATH = CACHE_DIR / "operators_snapshot.pkl"  # Processed data, keyed by source file hashes
+# "standalone": every process loads the data itself. "builder": also publishes a shared,
+# memory-mapped snapshot after every load. "reader": maps the builder's snapshot instead of
+# loading; workers share the mapped numeric arrays and postings, but each still unpickles
+# its own records and other Python objects (POSIX hosts).
+DATA_MODE = os.environ.get("DATA_MODE", "standalone")
+SHARED_SNAPSHOT_PATH = CACHE_DIR / "shared_snapshot.bin"
+SHARED_SNAPSHOT_POLL = 2  # Seconds between reader checks for a newly published shared snapshot
+# Worker processes for building operator records; 0 or 1 builds serially on the loading thread
+BUILD_WORKERS = int(os.environ.get("BUILD_WORKERS", "0"))
+BUILD_CHUNK_SIZE = 16  # Operators per work unit sent to a build worker
+
+# Result sets larger than this compute attributes with the vectorized batch engine
+BATCH_ATTRIBUTES_THRESHOLD = 32
+
+# Most items accepted by one batch attributes request
+BATCH_MAX_ITEMS = 500
+
+# Operators rendered per chunk when streaming NDJSON
+NDJSON_CHUNK_SIZE = 64
+
+# Byte budget for serialized responses kept by the response cache
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Entries memoized per data version: attributes per (operator, calculation settings),
+# and matching operators per normalized filter set
+ATTRIBUTE_MEMO_MAX_ENTRIES = 16384
+FILTER_MEMO_MAX_ENTRIES = 1024
+# Cached responses at least this large are also kept compressed for clients that accept it
+COMPRESSION_MIN_BYTES = 1024
+# gzip level, brotli quality and zstd level; brotli and zstd are used when their packages are installed
+COMPRESSION_LEVELS = {"gzip": 6, "br": 9, "zstd": 10}
 
 REQUIRED_FILES = [
     "character_table.json",
@@ -0,0 +1,187 @@
+from typing import List, Optional, Tuple
+import numpy as np
+from app.core.logic import (
+    BASE_STAT_KEYS, BASE_STAT_DEFAULTS, TRUST_STAT_KEYS, TRUST_STAT_DEFAULTS,
+    POTENTIAL_STAT_KEYS, MAX_TRUST_BONUS, calculate_attributes, potential_stats
+)
+
+class AttributeBatchEngine:
+    """
+    Struct-of-arrays copy of every operator's keyframe, favor and potential data,
+    used to compute attributes for many operators at once with NumPy.
+    Mirrors calculate_attributes exactly, including its per-operator clamping of
+    elite/level/potential and the int truncation of the final stats.
+    """
+    def __init__(self, operators: List[dict]):
+        n = len(operators)
+        self._rows = {op.get("charId"): row for row, op in enumerate(operators)}
+        max_frames = max((len(phase.get("attributesKeyFrames", [])) for op in operators for phase in op.get("phases", [])), default=1)
+        max_favor = max((len(op.get("favorKeyFrames") or []) for op in operators), default=1)
+        max_phases = max((len(op.get("phases", [])) for op in operators), default=1)
+        max_potential = max((len(op.get("potentialRanks", [])) for op in operators), default=0)
+
+        # Operators the vectorized path cannot reproduce are computed one by one
+        self.scalar_only = np.zeros(n, dtype=bool)
+        self.has_phases = np.zeros(n, dtype=bool)
+        self.phase_count = np.zeros(n, dtype=np.int64)
+        self.max_levels = np.ones((n, max_phases), dtype=np.int64)
+
+        self.frame_count = np.zeros((n, max_phases), dtype=np.int64)
+        self.frame_levels = np.zeros((n, max_phases, max(1, max_frames)), dtype=np.int64)
+        self.frame_values = np.zeros((n, max_phases, max(1, max_frames), len(BASE_STAT_KEYS)), dtype=np.float64)
+        self.frame_present = np.zeros(self.frame_values.shape, dtype=bool)
+
+        self.favor_count = np.zeros(n, dtype=np.int64)
+        self.favor_levels = np.zeros((n, max(1, max_favor)), dtype=np.int64)
+        self.favor_values = np.zeros((n, max(1, max_favor), len(TRUST_STAT_KEYS)), dtype=np.float64)
+        self.favor_present = np.zeros(self.favor_values.shape, dtype=bool)
+
+        self.potential_count = np.zeros(n, dtype=np.int64)
+        self.potential_values = np.zeros((n, max_potential + 1, len(POTENTIAL_STAT_KEYS)), dtype=np.float64)
+
+        for row, op in enumerate(operators):
+            phases = op.get("phases", [])
+            self.has_phases[row] = bool(phases)
+            self.phase_count[row] = len(phases)
+            for e, phase in enumerate(phases):
+                self.max_levels[row, e] = phase.get("maxLevel", 1)
+                frames = phase.get("attributesKeyFrames", [])
+                self.frame_count[row, e] = len(frames)
+                if not self._fill_frames(frames, BASE_STAT_KEYS, self.frame_levels[row, e], self.frame_values[row, e], self.frame_present[row, e]):
+                    self.scalar_only[row] = True
+
+            favor_frames = op.get("favorKeyFrames") or []
+            self.favor_count[row] = len(favor_frames)
+            if not self._fill_frames(favor_frames, TRUST_STAT_KEYS, self.favor_levels[row], self.favor_values[row], self.favor_present[row]):
+                self.scalar_only[row] = True
+            # Trust interpolation reads missing keys as 0 on both ends
+            self.favor_present[row] = True
+
+            # Cumulative bonuses are summed in rank order, exactly like calculate_attributes
+            potential_ranks = op.get("potentialRanks", [])
+            self.potential_count[row] = len(potential_ranks)
+            for potential in range(len(potential_ranks) + 1):
+                self.potential_values[row, potential] = potential_stats(potential_ranks, potential)
+
+    @staticmethod
+    def _fill_frames(frames: list, keys: tuple, levels, values, present) -> bool:
+        """Copies keyframes into preallocated columns. Returns False if they cannot be vectorized."""
+        previous_level = None
+        for k, frame in enumerate(frames):
+            levels[k] = frame["level"]
+            if previous_level is not None and frame["level"] < previous_level:
+                return False
+            previous_level = frame["level"]
+            for s, key in enumerate(keys):
+                value = frame["data"].get(key)
+                if value is None:
+                    continue
+                if not isinstance(value, (int, float)):
+                    return False
+                values[k, s] = value
+                present[k, s] = True
+        return True
+
+    def calculate(self, operators: List[dict], elite: int = None, level: int = None, trust: int = 100, potential: int = 5) -> List[Optional[dict]]:
+        """
+        Computes attributes for every operator in `operators`, in order.
+        Results are plain dicts keyed like the serialized CharacterAttributes (with `def`),
+        which skips building one model instance per operator.
+        """
+        return self.calculate_each(operators, [(elite, level, trust, potential)] * len(operators))
+
+    def calculate_each(self, operators: List[dict], params: List[Tuple[Optional[int], Optional[int], int, int]]) -> List[Optional[dict]]:
+        """
+        Like `calculate`, but with its own (elite, level, trust, potential) for each operator,
+        still computed in a single vectorized pass.
+        """
+        if not operators:
+            return []
+        n = len(operators)
+        rows = np.fromiter((self._rows[op.get("charId")] for op in operators), dtype=np.int64, count=n)
+        elite_given = np.fromiter((p[0] is not None for p in params), dtype=bool, count=n)
+        elite_values = np.fromiter((p[0] or 0 for p in params), dtype=np.int64, count=n)
+        level_given = np.fromiter((p[1] is not None for p in params), dtype=bool, count=n)
+        level_values = np.fromiter((p[1] or 0 for p in params), dtype=np.int64, count=n)
+        trusts = np.fromiter((p[2] for p in params), dtype=np.int64, count=n)
+        potential_values = np.fromiter((p[3] for p in params), dtype=np.int64, count=n)
+
+        # Per-operator clamping, as in calculate_attributes
+        max_elite = np.maximum(self.phase_count[rows] - 1, 0)
+        elites = np.where(elite_given, np.clip(elite_values, 0, max_elite), max_elite)
+        max_level_in_phase = self.max_levels[rows, elites]
+        levels = np.where(level_given, np.clip(level_values, 1, max_level_in_phase), max_level_in_phase)
+        potentials = np.clip(potential_values, 0, self.potential_count[rows])
+        calc_trust = np.clip(trusts, 0, MAX_TRUST_BONUS)
+
+        base = _interpolate(
+            self.frame_levels[rows, elites], self.frame_values[rows, elites], self.frame_present[rows, elites],
+            self.frame_count[rows, elites], levels, np.array(BASE_STAT_DEFAULTS, dtype=np.float64)
+        )
+        trust_stats = _interpolate(
+            self.favor_levels[rows], self.favor_values[rows], self.favor_present[rows],
+            self.favor_count[rows], calc_trust, np.array(TRUST_STAT_DEFAULTS, dtype=np.float64)
+        )
+        pot = self.potential_values[rows, potentials]
+
+        summed = base[:, :4] + trust_stats + pot[:, :4]
+        # Columns in BASE_STAT_KEYS order, which is also the CharacterAttributes field order;
+        # ints are truncated like int()
+        columns = (
+            np.trunc(summed[:, 0]).astype(np.int64).tolist(),
+            np.trunc(summed[:, 1]).astype(np.int64).tolist(),
+            np.trunc(summed[:, 2]).astype(np.int64).tolist(),
+            summed[:, 3].tolist(),
+            np.trunc(base[:, 4] + pot[:, 4]).astype(np.int64).tolist(),
+            np.trunc(base[:, 5] + pot[:, 5]).astype(np.int64).tolist(),
+            base[:, 6].tolist(),
+            (base[:, 7] + pot[:, 7]).tolist(),
+            base[:, 8].tolist(),
+            np.trunc(base[:, 9] + pot[:, 6]).astype(np.int64).tolist(),
+        )
+
+        results = []
+        for i, values in enumerate(zip(*columns)):
+            row = rows[i]
+            if not self.has_phases[row]:
+                results.append(None)
+            elif self.scalar_only[row]:
+                attributes = calculate_attributes(operators[i], *params[i])
+                results.append(attributes.model_dump(by_alias=True))
+            else:
+                results.append(dict(zip(BASE_STAT_KEYS, values)))
+        return results
+
+def _interpolate(frame_levels, frame_values, frame_present, frame_count, targets, defaults):
+    """
+    Vectorized keyframe interpolation with the same frame selection as calculate_attributes:
+    the upper frame is the first one at or above the target, the lower frame the last one
+    at or below it, keys missing from the lower frame fall back to the defaults and keys
+    missing from the upper frame interpolate towards 0.
+    """
+    m, k = frame_levels.shape
+    idx = np.arange(m)
+    valid = np.arange(k)[None, :] < frame_count[:, None]
+    at_or_above = (frame_levels >= targets[:, None]) & valid
+    has_upper = at_or_above.any(axis=1)
+    first_upper = np.argmax(at_or_above, axis=1)
+    last = np.maximum(frame_count - 1, 0)
+
+    upper = np.where(has_upper, first_upper, last)
+    exact = frame_levels[idx, upper] == targets
+    lower = np.where(has_upper & ~exact, np.maximum(upper - 1, 0), upper)
+
+    lower_levels = frame_levels[idx, lower]
+    upper_levels = frame_levels[idx, upper]
+    lower_values = frame_values[idx, lower]
+    upper_values = np.where(frame_present[idx, upper], frame_values[idx, upper], 0.0)
+    lower_present = frame_present[idx, lower]
+
+    same = (lower_levels == upper_levels)[:, None]
+    span = np.where(lower_levels == upper_levels, 1, upper_levels - lower_levels)
+    ratio = ((targets - lower_levels) / span)[:, None]
+    interpolated = lower_values + (upper_values - lower_values) * ratio
+
+    values = np.where(same, lower_values, interpolated)
+    values = np.where(lower_present, values, defaults[None, :])
+    return np.where((frame_count > 0)[:, None], values, defaults[None, :])
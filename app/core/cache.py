@@ -0,0 +1,245 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Compressed copies of `body` by content coding, added by ResponseCache.add_variant
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(variant) for variant in self.variants.values())
+
+class ResponseCache:
+    """
+    LRU cache of serialized response bodies, bounded by their total size in bytes.
+    Keys must include the data version so a reload never serves stale bodies;
+    entries of older versions simply age out.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, body: bytes, version: int, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        """
+        Stores `body` (plus any extra response `headers`) and returns the entry,
+        with a strong ETag tied to the data version.
+        """
+        entry = CachedResponse(body=body, etag=make_etag(body, version), headers=dict(headers or {}))
+        if len(body) > self.max_bytes:
+            return entry
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous.size
+            self._entries[key] = entry
+            self._size += len(body)
+            self._evict()
+        return entry
+
+    def add_variant(self, key: Hashable, entry: CachedResponse, encoding: str, body: bytes):
+        """Keeps `body`, `entry`'s body compressed with `encoding`, alongside it while the entry is cached."""
+        with self._lock:
+            if encoding in entry.variants:
+                return
+            entry.variants[encoding] = body
+            if self._entries.get(key) is entry:
+                self._size += len(body)
+                self._evict()
+
+    def _evict(self):
+        # Called with the lock held
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+            self.evictions += 1
+
+    def peek(self, key: Hashable) -> Optional[CachedResponse]:
+        """Like `get`, but neither counts the lookup nor refreshes the entry's recency."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "compressedVariants": sum(len(entry.variants) for entry in self._entries.values()),
+                "bytes": self._size,
+                "maxBytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+# Returned by MemoCache lookups that miss, since None is a valid memoized value
+MISSING = object()
+
+class MemoCache:
+    """
+    Bounded LRU memo of values computed from one data version. The first lookup for a
+    newer version drops every entry at once; lookups for an older version (requests still
+    holding a previous snapshot) neither read nor fill it, so no value outlives its data.
+    """
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, version: int, key: Hashable) -> Any:
+        return self.get_many(version, [key])[0]
+
+    def put(self, version: int, key: Hashable, value: Any):
+        self.put_many(version, [(key, value)])
+
+    def get_many(self, version: int, keys: Iterable[Hashable]) -> List[Any]:
+        """Looks up every key under a single lock acquisition; misses come back as MISSING."""
+        with self._lock:
+            if not self._sync(version):
+                values = [MISSING for _ in keys]
+                self.misses += len(values)
+                return values
+            values = []
+            for key in keys:
+                value = self._entries.get(key, MISSING)
+                if value is MISSING:
+                    self.misses += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                values.append(value)
+            return values
+
+    def put_many(self, version: int, items: Iterable[Tuple[Hashable, Any]]):
+        with self._lock:
+            if not self._sync(version):
+                return
+            for key, value in items:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _sync(self, version: int) -> bool:
+        # Called with the lock held. Returns whether `version` is the one being memoized.
+        if version > self._version:
+            self._entries.clear()
+            self._version = version
+            self.invalidations += 1
+        return version == self._version
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time. Callers arriving while the computation
+    for their key is running wait for it and get the same result (or exception) instead of
+    repeating the work. Keys must include the data version, like response cache keys.
+    """
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "inFlight": len(self._flights),
+            }
+
+def make_etag(body: bytes, version: int) -> str:
+    return f'"{version}-{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluates an If-None-Match header against `etag` (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
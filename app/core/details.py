@@ -0,0 +1,180 @@
+import json
+import zlib
+from typing import Iterable, List
+from app.models import SkillLevel, Skill, PotentialInfo, ModuleLevel, Module, Token
+from app.utils import clean_markup, replace_description_placeholders
+
+# Operator fields built from their source entries on first use instead of at load time
+DETAIL_FIELDS = ("skills", "modules", "potentials")
+
+def encode_detail_sources(skill_refs: list, skill_entries: dict, modules: list) -> bytes:
+    """
+    Canonical JSON encoding of the source entries skills and modules are built from:
+    the operator's skill references, its skill entries and (uniequip, battle_equip) pairs.
+    """
+    packed = {"skillRefs": skill_refs, "skills": skill_entries, "modules": modules}
+    return json.dumps(packed, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def pack_detail_sources(encoded: bytes) -> bytes:
+    """Compresses encoded detail sources for keeping on the record until a request needs them."""
+    return zlib.compress(encoded, 1)
+
+def materialize(op: dict, fields: Iterable[str] = DETAIL_FIELDS) -> dict:
+    """
+    Builds the detail `fields` missing from the operator record and stores them on it,
+    so each is built at most once per record. Returns the record.
+    """
+    missing = [field for field in fields if field not in op]
+    if not missing:
+        return op
+    for field, value in build_details(op, missing).items():
+        op[field] = value
+    return op
+
+def with_details(op: dict, fields: Iterable[str] = DETAIL_FIELDS) -> dict:
+    """
+    The record with the detail `fields` it lacks built onto a shallow copy, leaving the record
+    itself as it was. For one-off renders that should not keep details memoized.
+    """
+    missing = [field for field in fields if field not in op]
+    if not missing:
+        return op
+    row = op.copy()
+    for field, value in build_details(op, missing).items():
+        row[field] = value
+    return row
+
+def build_details(op: dict, fields: Iterable[str] = DETAIL_FIELDS) -> dict:
+    """Builds the detail `fields` of an operator record from its sources, without storing them on it."""
+    built = {}
+    sources = None
+    for field in fields:
+        if field == "potentials":
+            built["potentials"] = build_potentials(op.get("potentialRanks"))
+            continue
+        if sources is None:
+            sources = json.loads(zlib.decompress(op["detailSources"]))
+        if field == "skills":
+            built["skills"] = build_skills(sources["skillRefs"], sources["skills"])
+        elif field == "modules":
+            built["modules"] = build_modules(sources["modules"])
+    return built
+
+def build_skills(skill_refs: list, skill_entries: dict) -> List[Skill]:
+    operator_skills = []
+    for skill_ref in skill_refs or []:
+        skill_id = skill_ref.get("skillId")
+        if skill_id and skill_id in skill_entries:
+            full_skill_info = skill_entries[skill_id]
+            skill_levels = []
+            for i, level_data in enumerate(full_skill_info.get("levels", [])):
+                blackboard = {item["key"]: item["value"] for item in level_data.get("blackboard", [])}
+
+                level_str = f"专{i - 6}" if i > 6 else str(i + 1)
+                skill_description = clean_markup(level_data.get("description"))
+                # Pass the original blackboard directly
+                filled_description = replace_description_placeholders(skill_description, blackboard)
+
+                skill_levels.append(
+                    SkillLevel(
+                        level=level_str,
+                        name=clean_markup(level_data.get("name")),
+                        description=filled_description,
+                        spCost=level_data.get("spData", {}).get("spCost", 0),
+                        initialSp=level_data.get("spData", {}).get("initSp", 0),
+                        duration=blackboard.get("duration", 0.0)
+                    )
+                )
+            operator_skills.append(Skill(skillId=skill_id, levels=skill_levels))
+    return operator_skills
+
+def build_tokens(skill_refs: list, token_entries: dict) -> List[Token]:
+    operator_tokens = []
+    token_ids_added = set()
+    for skill_ref in skill_refs or []:
+        token_id = skill_ref.get("overrideTokenKey")
+        if token_id and token_id not in token_ids_added:
+            token_data = token_entries.get(token_id)
+            if token_data:
+                operator_tokens.append(Token(
+                    tokenId=token_id,
+                    name=token_data.get("name"),
+                    description=clean_markup(token_data.get("description")),
+                    profession=token_data.get("profession"),
+                    subProfessionId=token_data.get("subProfessionId")
+                ))
+                token_ids_added.add(token_id)
+    return operator_tokens
+
+def build_modules(modules: list) -> List[Module]:
+    operator_modules = []
+    for equip_info, battle_equip in modules:
+        equip_id = equip_info["uniEquipId"]
+
+        module_levels = []
+        if battle_equip and "phases" in battle_equip:
+            for phase in battle_equip["phases"]:
+                lvl = phase["equipLevel"]
+
+                # Attributes
+                attrs = {}
+                # Create a base blackboard from attributes for description replacement
+                base_blackboard = {}
+                for attr in phase.get("attributeBlackboard", []):
+                    attrs[attr["key"]] = attr["value"]
+                    base_blackboard[attr["key"]] = attr["value"]
+
+                # Trait/Talent Upgrades
+                trait_up = None
+                talent_up = None
+
+                for part in phase.get("parts", []):
+                    # Trait
+                    if part.get("target") == "TRAIT" and part.get("overrideTraitDataBundle"):
+                        candidates = part["overrideTraitDataBundle"].get("candidates", [])
+                        if candidates:
+                            cand = candidates[-1]
+                            desc_template = cand.get("overrideDescripton") or cand.get("additionalDescription")
+                            if desc_template:
+                                # Merge attribute blackboard with candidate blackboard
+                                cand_blackboard = {item["key"]: item["value"] for item in cand.get("blackboard", [])}
+                                combined_blackboard = {**base_blackboard, **cand_blackboard}
+                                trait_up = replace_description_placeholders(clean_markup(desc_template), combined_blackboard)
+
+                    # Talent
+                    if part.get("target") in ["TALENT", "TALENT_DATA_ONLY"] and part.get("addOrOverrideTalentDataBundle"):
+                        candidates = part["addOrOverrideTalentDataBundle"].get("candidates", [])
+                        if candidates:
+                            cand = candidates[-1]
+                            desc_template = cand.get("upgradeDescription")
+                            if desc_template:
+                                # Merge attribute blackboard with candidate blackboard
+                                cand_blackboard = {item["key"]: item["value"] for item in cand.get("blackboard", [])} if cand.get("blackboard") else {}
+                                combined_blackboard = {**base_blackboard, **cand_blackboard}
+                                talent_up = replace_description_placeholders(clean_markup(desc_template), combined_blackboard)
+
+                module_levels.append(ModuleLevel(
+                    level=lvl,
+                    attributes=attrs,
+                    trait_upgrade=trait_up,
+                    talent_upgrade=talent_up
+                ))
+
+        operator_modules.append(Module(
+            moduleId=equip_id,
+            name=equip_info["uniEquipName"],
+            description=equip_info.get("uniEquipDesc"),
+            typeIcon=equip_info["typeIcon"],
+            typeName=equip_info["typeName1"] + ("-" + equip_info["typeName2"] if equip_info.get("typeName2") else ""),
+            levels=module_levels
+        ))
+    return operator_modules
+
+def build_potentials(potential_ranks: list) -> List[PotentialInfo]:
+    operator_potentials = []
+    if potential_ranks:
+        for i, potential_rank in enumerate(potential_ranks):
+            if potential_rank and potential_rank.get("description"):
+                rank_str = f"潜能{i + 2}"
+                operator_potentials.append(PotentialInfo(rank=rank_str, description=clean_markup(potential_rank["description"])))
+    return operator_potentials
@@ -0,0 +1,95 @@
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class LoadReport:
+    """
+    Per-stage measurements of one data load: wall and CPU time, bytes read, traced memory
+    (only while tracemalloc is tracing) and the number of items each stage processed.
+    Every finished stage is also logged at INFO level, with its record as the `loadStage` field.
+    Stages must not be nested, since each one resets the traced memory peak.
+    """
+    def __init__(self):
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self._wall_seconds = 0.0
+        self._cpu_seconds = 0.0
+        self.stages: List[dict] = []
+        self.peak_traced_bytes: Optional[int] = None
+
+    @contextmanager
+    def stage(self, name: str, target: Optional[str] = None) -> Iterator[dict]:
+        """
+        Measures the enclosed block as stage `name`, optionally for one `target` (a file or hook).
+        The yielded record takes the stage's `bytesRead` and a `counts` dict of processed items.
+        """
+        record = {"name": name, "target": target}
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            traced_before, peak_before = tracemalloc.get_traced_memory()
+            self._note_peak(peak_before)
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wallSeconds"] = time.perf_counter() - started
+            record["cpuSeconds"] = time.process_time() - cpu_started
+            if tracing and tracemalloc.is_tracing():
+                traced, peak = tracemalloc.get_traced_memory()
+                record["peakTracedBytes"] = peak
+                record["tracedBytesDelta"] = traced - traced_before
+                self._note_peak(peak)
+            self.stages.append(record)
+            self.finish()
+            logger.info("Load stage %s.", describe_stage(record), extra={"loadStage": dict(record)})
+
+    def finish(self):
+        """Fixes the report's total wall and CPU time at now."""
+        self._wall_seconds = time.perf_counter() - self._started
+        self._cpu_seconds = time.process_time() - self._cpu_started
+
+    def timings(self) -> Dict[str, float]:
+        """Wall seconds per stage name, summed over the stage's targets."""
+        timings = {}
+        for record in self.stages:
+            timings[record["name"]] = timings.get(record["name"], 0.0) + record["wallSeconds"]
+        return timings
+
+    def counts(self) -> Dict[str, int]:
+        totals = {}
+        for record in self.stages:
+            for item, count in (record.get("counts") or {}).items():
+                totals[item] = totals.get(item, 0) + count
+        return totals
+
+    def to_dict(self) -> dict:
+        return {
+            "startedAt": self.started_at,
+            "wallSeconds": self._wall_seconds,
+            "cpuSeconds": self._cpu_seconds,
+            "bytesRead": sum(record.get("bytesRead") or 0 for record in self.stages),
+            "peakTracedBytes": self.peak_traced_bytes,
+            "counts": self.counts(),
+            "stages": list(self.stages),
+        }
+
+    def _note_peak(self, peak: int):
+        self.peak_traced_bytes = max(self.peak_traced_bytes or 0, peak)
+
+def describe_stage(record: dict) -> str:
+    parts = [f"{record['wallSeconds']:.3f}s wall", f"{record['cpuSeconds']:.3f}s CPU"]
+    if record.get("bytesRead") is not None:
+        parts.append(f"{record['bytesRead'] / 1024:.1f} KiB read")
+    if record.get("peakTracedBytes") is not None:
+        parts.append(f"peak {record['peakTracedBytes'] / 1024 / 1024:.1f} MiB traced")
+    for item, count in (record.get("counts") or {}).items():
+        parts.append(f"{count} {item}")
+    label = f"{record['name']} {record['target']}" if record.get("target") else record["name"]
+    return f"{label}: " + ", ".join(parts)
@@ -1,31 +1,65 @@
+import hashlib
 import json
+import multiprocessing
+import pickle
 import time
 import os
+import shutil
+import urllib.error
 import urllib.request
-from app.models import CharacterAttributes, SkillLevel, Skill, PotentialInfo, ModuleLevel, Module, Token
-from app.utils import clean_markup, replace_description_placeholders, parse_handbook_info
-from app.config import CACHE_DIR, REMOTE_BASE_URL, CACHE_DURATION, REQUIRED_FILES
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from app.models import CharacterAttributes
+from app.core.details import encode_detail_sources, pack_detail_sources, build_tokens
+from app.core.instrumentation import LoadReport
+from app.core.logic import build_stat_table
+from app.core.record import RecordCompactor, deep_sizeof
+from app.utils import clean_markup, parse_handbook_info
+from app.config import (
+    CACHE_DIR, REMOTE_BASE_URL, CACHE_DURATION, REQUIRED_FILES, SNAPSHOT_PATH,
+    DOWNLOAD_WORKERS, DOWNLOAD_TIMEOUT, VALIDATORS_FILE, BUILD_WORKERS, BUILD_CHUNK_SIZE,
+    DATA_MODE, SHARED_SNAPSHOT_PATH
+)
 from app.db.repository import db
+from app.db.shared import read_shared_header, read_shared_snapshot, write_shared_snapshot
 
 # Global State
 operators_data = []
 NATION_MAP = {}
 SUBPRO_MAP = {}
+last_load_report: Optional[LoadReport] = None
+published_source_hashes: Optional[Dict[str, Optional[str]]] = None
+published_shared_identity: Optional[tuple] = None
+current_snapshot: Optional[dict] = None
+last_build_changes: Optional[dict] = None
+last_parallel_build: Optional[dict] = None
+last_download_error: Optional[str] = None
+last_download_bytes: Dict[str, int] = {}
 
-def update_cache_if_needed():
+# Bump whenever the structure of the built operator records changes
+SNAPSHOT_FORMAT = 4
+# Modules whose code shapes the built records; editing them invalidates the snapshot too
+SNAPSHOT_CODE_FILES = ["core/loader.py", "core/details.py", "core/record.py", "core/logic.py", "utils.py", "models.py"]
+# Load stages that make up a build from the source tables
+BUILD_STAGES = ("parse", "collect", "fingerprint", "build", "assemble")
+# The shared snapshot also pickles the indexes and the batch engine
+SHARED_SNAPSHOT_CODE_FILES = SNAPSHOT_CODE_FILES + ["db/repository.py", "db/index.py", "db/search.py", "db/shared.py", "core/batch.py"]
+
+def update_cache_if_needed(base_url: str = REMOTE_BASE_URL, cache_dir: Path = CACHE_DIR, force: bool = False) -> bool:
     """
     Checks if cache is missing or outdated (older than 24h).
-    Downloads files from REMOTE_BASE_URL if needed.
+    Downloads files from `base_url` if needed (or if `force` is set) and returns True if any file changed.
     """
-    if not CACHE_DIR.exists():
-        print(f"Creating cache directory: {CACHE_DIR}")
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    if not cache_dir.exists():
+        print(f"Creating cache directory: {cache_dir}")
+        cache_dir.mkdir(parents=True, exist_ok=True)
 
-    needs_update = False
+    needs_update = force
     
     # Check if any required file is missing
     for filename in REQUIRED_FILES:
-        file_path = CACHE_DIR / filename
+        file_path = cache_dir / filename
         if not file_path.exists():
             print(f"File missing in cache: {filename}")
             needs_update = True
@@ -33,49 +67,314 @@ def update_cache_if_needed():
     
     # Check if cache is expired (using character_table.json as reference)
     if not needs_update:
-        ref_file = CACHE_DIR / "character_table.json"
+        ref_file = cache_dir / "character_table.json"
         if ref_file.exists():
             last_modified = ref_file.stat().st_mtime
             if time.time() - last_modified > CACHE_DURATION:
                 print("Cache is older than 24 hours.")
                 needs_update = True
     
-    if needs_update:
-        print("Starting data download from remote source...")
-        success = True
-        for filename in REQUIRED_FILES:
-            url = REMOTE_BASE_URL + filename
-            target_path = CACHE_DIR / filename
+    global last_download_error
+    last_download_error = None
+    if not needs_update:
+        print("Cache is up to date.")
+        return False
+
+    print("Starting data download from remote source...")
+    return download_files(base_url, cache_dir)
+
+def download_files(base_url: str = REMOTE_BASE_URL, cache_dir: Path = CACHE_DIR) -> bool:
+    """
+    Downloads every file in REQUIRED_FILES concurrently into a staging directory, using
+    conditional requests when a cached copy exists. Files are only moved into the cache
+    once all downloads have succeeded, so a failed update never leaves a mixed set behind.
+    Returns True if any cached file was replaced.
+    """
+    global last_download_error, last_download_bytes
+    last_download_bytes = {}
+    validators_path = cache_dir / VALIDATORS_FILE
+    validators = {}
+    if validators_path.exists():
+        try:
+            with open(validators_path, 'r', encoding='utf-8') as f:
+                validators = json.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable download validators: {e}")
+
+    staging_dir = cache_dir / ".download"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    staging_dir.mkdir(parents=True, exist_ok=True)
+
+    def fetch(filename: str):
+        target_path = cache_dir / filename
+        known = validators.get(filename, {}) if target_path.exists() else {}
+        return download_file(base_url + filename, staging_dir / filename, known)
+
+    results = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        futures = {executor.submit(fetch, filename): filename for filename in REQUIRED_FILES}
+        for future in as_completed(futures):
+            filename = futures[future]
             try:
-                print(f"Downloading {filename}...")
-                # Download with a timeout to prevent hanging
-                with urllib.request.urlopen(url, timeout=30) as response, open(target_path, 'wb') as out_file:
-                    out_file.write(response.read())
+                results[filename] = future.result()
             except Exception as e:
-                print(f"Failed to download {filename}: {e}")
-                success = False
-                # If download fails and we don't have a local file, we are in trouble.
-                # If we have an old file, we'll just log the error and use the old one.
-                if not target_path.exists():
-                    print(f"Critical: {filename} missing and download failed.")
-        
-        if success:
-            print("Data cache updated successfully.")
+                errors[filename] = e
+
+    if errors:
+        last_download_error = "; ".join(f"{filename}: {e}" for filename, e in errors.items())
+        for filename, e in errors.items():
+            print(f"Failed to download {filename}: {e}")
+            # If download fails and we don't have a local file, we are in trouble.
+            # If we have old files, we'll just log the error and keep using them.
+            if not (cache_dir / filename).exists():
+                print(f"Critical: {filename} missing and download failed.")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        print("Cache update failed. Using existing files if available.")
+        return False
+
+    # Commit the whole set only now that every file has been fetched
+    changed = False
+    for filename in REQUIRED_FILES:
+        target_path = cache_dir / filename
+        modified, file_validators = results[filename]
+        if modified:
+            last_download_bytes[filename] = (staging_dir / filename).stat().st_size
+            os.replace(staging_dir / filename, target_path)
+            changed = True
+        else:
+            # Unchanged upstream: refresh the mtime so the cache counts as fresh again
+            os.utime(target_path)
+        validators[filename] = file_validators
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+    tmp_path = validators_path.with_name(validators_path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(validators, f)
+    os.replace(tmp_path, validators_path)
+
+    print(f"Data cache updated successfully ({sum(1 for modified, _ in results.values() if modified)} of {len(results)} files changed).")
+    return changed
+
+def download_file(url: str, target_path: Path, known_validators: dict) -> Tuple[bool, dict]:
+    """
+    Streams `url` into `target_path`, sending If-None-Match/If-Modified-Since from `known_validators`.
+    Returns (modified, validators); on 304 nothing is written and the known validators are kept.
+    """
+    request = urllib.request.Request(url)
+    if known_validators.get("etag"):
+        request.add_header("If-None-Match", known_validators["etag"])
+    if known_validators.get("last_modified"):
+        request.add_header("If-Modified-Since", known_validators["last_modified"])
+
+    try:
+        # Download with a timeout to prevent hanging
+        with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response, open(target_path, 'wb') as out_file:
+            shutil.copyfileobj(response, out_file, 1024 * 1024)
+            expected_length = response.headers.get("Content-Length")
+            if expected_length is not None and out_file.tell() != int(expected_length):
+                raise IOError(f"incomplete body ({out_file.tell()} of {expected_length} bytes)")
+            new_validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            print(f"{target_path.name} not modified.")
+            return False, known_validators
+        raise
+
+    print(f"Downloaded {target_path.name}.")
+    return True, new_validators
+
+def hash_source_files() -> Dict[str, Optional[str]]:
+    """Content hashes of the cached source tables, used to validate the processed snapshot."""
+    hashes = {}
+    for filename in REQUIRED_FILES:
+        file_path = CACHE_DIR / filename
+        if not file_path.exists():
+            hashes[filename] = None
+            continue
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        hashes[filename] = digest.hexdigest()
+    return hashes
+
+def code_fingerprint(code_files: List[str] = SNAPSHOT_CODE_FILES) -> str:
+    app_dir = Path(__file__).resolve().parent.parent
+    digest = hashlib.sha256()
+    for relative_path in code_files:
+        digest.update((app_dir / relative_path).read_bytes())
+    return digest.hexdigest()
+
+def read_snapshot() -> Optional[dict]:
+    """Returns the processed snapshot on disk if it was built by this version of the code."""
+    if not SNAPSHOT_PATH.exists():
+        return None
+    try:
+        with open(SNAPSHOT_PATH, 'rb') as f:
+            snapshot = pickle.load(f)
+    except Exception as e:
+        print(f"Ignoring unreadable data snapshot: {e}")
+        return None
+    if snapshot.get("format") != SNAPSHOT_FORMAT or snapshot.get("code") != code_fingerprint():
+        print("Data snapshot was built by a different version of the loader.")
+        return None
+    return snapshot
+
+def write_snapshot(snapshot: dict):
+    # Write to a temp file first so a crash never leaves a truncated snapshot behind
+    tmp_path = SNAPSHOT_PATH.with_name(SNAPSHOT_PATH.name + ".tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except Exception as e:
+        print(f"Failed to write data snapshot: {e}")
+
+def load_data(force_download: bool = False, only_if_changed: bool = False, skip_download: bool = False,
+              report: Optional[LoadReport] = None) -> bool:
+    """
+    Refreshes the cache, builds (or restores) the operator records and publishes them to `db`
+    as a new snapshot. With `only_if_changed`, nothing is published when the source files are
+    identical to the ones behind the current snapshot; with `skip_download`, only the files
+    already on disk are used. When the source files changed, only the operators whose inputs
+    changed are rebuilt. Returns True if new data was published.
+    Each stage is measured into `report` (a new one if not given), which is kept as
+    `last_load_report` unless the load stopped early because nothing changed.
+    In the `reader` data mode, the builder's shared snapshot is mapped instead.
+    """
+    report = report if report is not None else LoadReport()
+    if DATA_MODE == "reader":
+        return load_shared_snapshot(only_if_changed=only_if_changed, report=report)
+
+    global last_load_report, last_download_bytes, published_source_hashes, current_snapshot, last_build_changes, last_parallel_build
+    last_build_changes = None
+    last_parallel_build = None
+
+    # 1. Update cache before loading
+    if not skip_download:
+        last_download_bytes = {}
+        with report.stage("download") as stage:
+            update_cache_if_needed(force=force_download)
+            stage["bytesRead"] = sum(last_download_bytes.values())
+            stage["files"] = dict(last_download_bytes)
+
+    print(f"Loading data from cache: {CACHE_DIR}")
+
+    # 2. Reuse the processed snapshot when the source files are unchanged
+    with report.stage("hash") as stage:
+        source_hashes = hash_source_files()
+        stage["bytesRead"] = sum((CACHE_DIR / filename).stat().st_size for filename, digest in source_hashes.items() if digest)
+
+    if only_if_changed and source_hashes == published_source_hashes:
+        print("Source data unchanged. Keeping the published snapshot.")
+        return False
+
+    last_load_report = report
+    with report.stage("snapshot_read") as stage:
+        if current_snapshot is not None:
+            snapshot = current_snapshot
         else:
-            print("Cache update finished with errors. Using existing files if available.")
+            snapshot = read_snapshot()
+            stage["bytesRead"] = SNAPSHOT_PATH.stat().st_size if SNAPSHOT_PATH.exists() else 0
+
+    if snapshot is not None and snapshot["source_hashes"] == source_hashes:
+        build_seconds = sum(snapshot["build_timings"].get(name, 0) for name in BUILD_STAGES)
+        print(f"Using processed data snapshot (full build took {build_seconds:.3f}s).")
     else:
-        print("Cache is up to date.")
+        # 3. Rebuild, reusing the records of the previous snapshot for unchanged operators
+        built = build_operators(report, previous=snapshot)
+        if built is None:
+            report.finish()
+            return False
+        operators, nation_map, subpro_map, fingerprints, last_build_changes = built
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "code": code_fingerprint(),
+            "source_hashes": source_hashes,
+            "operators": operators,
+            "nation_map": nation_map,
+            "subpro_map": subpro_map,
+            "fingerprints": fingerprints,
+            "build_timings": report.timings(),
+        }
+        with report.stage("snapshot_write"):
+            write_snapshot(snapshot)
+
+    if DATA_MODE == "builder" and db.version == 0:
+        # Continue the version sequence of the last shared snapshot, so readers never see a version twice
+        header = read_shared_header(SHARED_SNAPSHOT_PATH)
+        if header:
+            db.advance_version(header["version"])
+
+    with report.stage("index") as stage:
+        repository_snapshot = db.build_snapshot(snapshot["operators"], snapshot["nation_map"], snapshot["subpro_map"])
+        stage["counts"] = {"textDocuments": len(repository_snapshot.text_index.documents)}
+    db.publish(repository_snapshot)
+
+    if DATA_MODE == "builder":
+        with report.stage("shared_write"):
+            try:
+                write_shared_snapshot(repository_snapshot, SHARED_SNAPSHOT_PATH, code_fingerprint(SHARED_SNAPSHOT_CODE_FILES))
+            except Exception as e:
+                print(f"Failed to write shared snapshot: {e}")
+
+    current_snapshot = snapshot
+    published_source_hashes = source_hashes
+    report.finish()
+    print(f"Data loaded successfully. {len(snapshot['operators'])} operators (data version {repository_snapshot.version}).")
+    print("Load timings: " + ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in report.timings().items()))
+    return True
+
+def load_shared_snapshot(only_if_changed: bool = False, report: Optional[LoadReport] = None) -> bool:
+    """
+    Maps the shared snapshot published by the builder process and publishes it to `db`.
+    With `only_if_changed`, nothing happens unless the builder replaced the file since.
+    Returns True if new data was published.
+    """
+    global last_load_report, published_shared_identity
+    if only_if_changed:
+        try:
+            stat = os.stat(SHARED_SNAPSHOT_PATH)
+        except FileNotFoundError:
+            return False
+        if (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size) == published_shared_identity:
+            return False
+
+    report = report if report is not None else LoadReport()
+    # Mapped, not read: pages are only read in as requests touch them, so no bytes are counted
+    with report.stage("shared_read") as stage:
+        loaded = read_shared_snapshot(SHARED_SNAPSHOT_PATH, code_fingerprint(SHARED_SNAPSHOT_CODE_FILES))
+        if loaded is not None:
+            stage["counts"] = {"operators": len(loaded[0].operators)}
+    if loaded is None:
+        print(f"No usable shared snapshot at {SHARED_SNAPSHOT_PATH} yet. Waiting for the builder.")
+        return False
+    repository_snapshot, identity = loaded
+    db.publish(repository_snapshot)
 
-def load_data():
+    last_load_report = report
+    report.finish()
+    published_shared_identity = identity
+    print(f"Mapped shared snapshot: {len(repository_snapshot.operators)} operators (data version {repository_snapshot.version}) "
+          f"in {stage['wallSeconds']:.3f}s.")
+    return True
+
+def build_operators(report: LoadReport, previous: Optional[dict] = None) -> Optional[tuple]:
+    """
+    Parses the cached source tables and builds the final operator records, measuring each
+    stage into `report`. Operators whose source fingerprint matches the one in `previous`
+    reuse their record from it.
+    Returns (operators, nation_map, subpro_map, fingerprints, changes), or None if the
+    tables cannot be read. `changes` is None when nothing could be reused.
+    """
     # Local variables to hold data before committing to DB
     temp_nation_map = {}
     temp_subpro_map = {}
-    
-    # 1. Update cache before loading
-    update_cache_if_needed()
 
-    print(f"Loading data from cache: {CACHE_DIR}")
-    
     # Paths now point to the CACHE_DIR
     char_table_path = CACHE_DIR / "character_table.json"
     handbook_path = CACHE_DIR / "handbook_info_table.json"
@@ -86,29 +385,22 @@ def load_data():
     handbook_team_path = CACHE_DIR / "handbook_team_table.json"
 
     try:
-        with open(char_table_path, 'r', encoding='utf-8') as f:
-            character_data = json.load(f)
-        with open(handbook_path, 'r', encoding='utf-8') as f:
-            handbook_data = json.load(f).get("handbookDict", {})
-        with open(skill_table_path, 'r', encoding='utf-8') as f:
-            skill_data = json.load(f)
-        with open(favor_table_path, 'r', encoding='utf-8') as f:
-            favor_data = json.load(f).get("favorFrames", {})
-        with open(uniequip_table_path, 'r', encoding='utf-8') as f:
-            uniequip_full_data = json.load(f)
-            uniequip_data = uniequip_full_data.get("equipDict", {})
-            # Load sub-profession mapping from uniequip_table.json
-            subpro_data = uniequip_full_data.get("subProfDict", {})
-        with open(battle_equip_table_path, 'r', encoding='utf-8') as f:
-            battle_equip_data = json.load(f)
+        character_data = load_table(report, char_table_path)
+        handbook_data = load_table(report, handbook_path).get("handbookDict", {})
+        skill_data = load_table(report, skill_table_path)
+        favor_data = load_table(report, favor_table_path).get("favorFrames", {})
+        uniequip_full_data = load_table(report, uniequip_table_path)
+        uniequip_data = uniequip_full_data.get("equipDict", {})
+        # Load sub-profession mapping from uniequip_table.json
+        subpro_data = uniequip_full_data.get("subProfDict", {})
+        battle_equip_data = load_table(report, battle_equip_table_path)
         
         # Load mapping tables
         if handbook_team_path.exists():
-            with open(handbook_team_path, 'r', encoding='utf-8') as f:
-                team_data = json.load(f)
-                for team_id, team_info in team_data.items():
-                    if isinstance(team_info, dict) and "powerName" in team_info:
-                        temp_nation_map[team_info["powerName"]] = team_id
+            team_data = load_table(report, handbook_team_path)
+            for team_id, team_info in team_data.items():
+                if isinstance(team_info, dict) and "powerName" in team_info:
+                    temp_nation_map[team_info["powerName"]] = team_id
         
         # Populate SUBPRO_MAP from uniequip_table.json's subProfDict
         for sub_id, sub_info in subpro_data.items():
@@ -120,198 +412,239 @@ def load_data():
 
     except Exception as e:
         print(f"Failed to load or parse data files: {e}")
-        return
-
-    # Organize modules by charId
-    char_modules_map = {}
-    for equip_id, equip_info in uniequip_data.items():
-        if not isinstance(equip_info, dict): continue
-        char_id = equip_info.get("charId")
-        if char_id:
-            if char_id not in char_modules_map:
-                char_modules_map[char_id] = []
-            char_modules_map[char_id].append(equip_info)
-
-    temp_operators_data = []
-    for char_id, char_info in character_data.items():
-        # Enhanced filtering to exclude tokens and non-characters
-        if not isinstance(char_info, dict): continue
-        sub_prof = char_info.get("subProfessionId", "")
-        if sub_prof == "notchar" or sub_prof.startswith("notchar"): continue
-        if char_info.get("profession") == "TOKEN": continue
-
-        char_info["charId"] = char_id
-        char_info["description"] = clean_markup(char_info.get("description"))
-        
-        # --- Calculate Max Stats ---
-        final_phase = char_info["phases"][-1]
-        max_level_stats = final_phase["attributesKeyFrames"][-1]["data"]
-        
-        trust_stats = {"maxHp": 0, "atk": 0, "def": 0, "magicResistance": 0}
-        if char_info.get("favorKeyFrames"):
-            favor_frame = char_info["favorKeyFrames"][-1]["data"]
-            trust_stats.update(favor_frame)
-
-        # Base stats at max level
-        final_stats = {
-            "maxHp": max_level_stats["maxHp"] + trust_stats["maxHp"],
-            "atk": max_level_stats["atk"] + trust_stats["atk"],
-            "def": max_level_stats["def"] + trust_stats["def"],
-            "magicResistance": max_level_stats["magicResistance"] + trust_stats["magicResistance"],
-            "cost": max_level_stats["cost"],
-            "blockCnt": max_level_stats["blockCnt"],
-            "moveSpeed": max_level_stats["moveSpeed"],
-            "attackSpeed": max_level_stats["attackSpeed"],
-            "baseAttackTime": max_level_stats["baseAttackTime"],
-            "respawnTime": max_level_stats["respawnTime"]
+        return None
+
+    with report.stage("collect") as stage:
+        # Organize modules by charId
+        char_modules_map = {}
+        for equip_id, equip_info in uniequip_data.items():
+            if not isinstance(equip_info, dict): continue
+            char_id = equip_info.get("charId")
+            if char_id:
+                if char_id not in char_modules_map:
+                    char_modules_map[char_id] = []
+                char_modules_map[char_id].append(equip_info)
+
+        tables = {
+            "character": character_data,
+            "skill": skill_data,
+            "handbook": handbook_data,
+            "favor": favor_data,
+            "modules": char_modules_map,
+            "battle_equip": battle_equip_data,
         }
 
-        # Add potential bonuses
-        for pot in char_info.get("potentialRanks", []):
-            if pot["buff"]:
-                attr_type = pot["buff"]["attributes"]["attributeModifiers"][0]["attributeType"]
-                value = pot["buff"]["attributes"]["attributeModifiers"][0]["value"]
-                if attr_type == 0: final_stats["maxHp"] += value
-                elif attr_type == 1: final_stats["atk"] += value
-                elif attr_type == 2: final_stats["def"] += value
-                elif attr_type == 3: final_stats["magicResistance"] += value
-                elif attr_type == 21: final_stats["cost"] -= value
-                elif attr_type == 22: final_stats["blockCnt"] += value
-                elif attr_type == 23: final_stats["respawnTime"] -= value
-
-        char_info["attributes"] = CharacterAttributes(def_=final_stats.pop("def"), **final_stats)
-
-        # --- Add Handbook Info ---
-        handbook_info = handbook_data.get(char_id)
-        if handbook_info and handbook_info.get("storyTextAudio"):
-            story_text = handbook_info["storyTextAudio"][0]["stories"][0]["storyText"]
-            parsed_info = parse_handbook_info(story_text)
-            char_info.update(parsed_info)
-
-        # --- Add Skill Info & Extract Tokens ---
-        operator_skills = []
-        operator_tokens = []
-        token_ids_added = set()
-        
-        if char_info.get("skills"):
-            for skill_ref in char_info["skills"]:
-                # 1. Extract Token Info
-                token_id = skill_ref.get("overrideTokenKey")
-                if token_id and token_id not in token_ids_added:
-                    token_data = character_data.get(token_id)
-                    if token_data:
-                        operator_tokens.append(Token(
-                            tokenId=token_id,
-                            name=token_data.get("name"),
-                            description=clean_markup(token_data.get("description")),
-                            profession=token_data.get("profession"),
-                            subProfessionId=token_data.get("subProfessionId")
-                        ))
-                        token_ids_added.add(token_id)
-                
-                # 2. Build Skill Object
-                skill_id = skill_ref.get("skillId")
-                if skill_id and skill_id in skill_data:
-                    full_skill_info = skill_data[skill_id]
-                    skill_levels = []
-                    for i, level_data in enumerate(full_skill_info.get("levels", [])):
-                        blackboard = {item["key"]: item["value"] for item in level_data.get("blackboard", [])}
-                        
-                        level_str = f"专{i - 6}" if i > 6 else str(i + 1)
-                        skill_description = clean_markup(level_data.get("description"))
-                        # Pass the original blackboard directly
-                        filled_description = replace_description_placeholders(skill_description, blackboard)
-
-                        skill_levels.append(
-                            SkillLevel(
-                                level=level_str,
-                                name=clean_markup(level_data.get("name")),
-                                description=filled_description,
-                                spCost=level_data.get("spData", {}).get("spCost", 0),
-                                initialSp=level_data.get("spData", {}).get("initSp", 0),
-                                duration=blackboard.get("duration", 0.0)
-                            )
-                        )
-                    operator_skills.append(Skill(skillId=skill_id, levels=skill_levels))
-        char_info["skills"] = operator_skills
-        char_info["tokens"] = operator_tokens
-
-        # --- Add Module Info ---
-        operator_modules = []
-        if char_id in char_modules_map:
-            for equip_info in char_modules_map[char_id]:
-                equip_id = equip_info["uniEquipId"]
-                battle_equip = battle_equip_data.get(equip_id)
-                
-                module_levels = []
-                if battle_equip and "phases" in battle_equip:
-                    for phase in battle_equip["phases"]:
-                        lvl = phase["equipLevel"]
-                        
-                        # Attributes
-                        attrs = {}
-                        # Create a base blackboard from attributes for description replacement
-                        base_blackboard = {}
-                        for attr in phase.get("attributeBlackboard", []):
-                            attrs[attr["key"]] = attr["value"]
-                            base_blackboard[attr["key"]] = attr["value"]
-                        
-                        # Trait/Talent Upgrades
-                        trait_up = None
-                        talent_up = None
-                        
-                        for part in phase.get("parts", []):
-                            # Trait
-                            if part.get("target") == "TRAIT" and part.get("overrideTraitDataBundle"):
-                                candidates = part["overrideTraitDataBundle"].get("candidates", [])
-                                if candidates:
-                                    cand = candidates[-1] 
-                                    desc_template = cand.get("overrideDescripton") or cand.get("additionalDescription")
-                                    if desc_template:
-                                        # Merge attribute blackboard with candidate blackboard
-                                        cand_blackboard = {item["key"]: item["value"] for item in cand.get("blackboard", [])}
-                                        combined_blackboard = {**base_blackboard, **cand_blackboard}
-                                        trait_up = replace_description_placeholders(clean_markup(desc_template), combined_blackboard)
-                            
-                            # Talent
-                            if part.get("target") in ["TALENT", "TALENT_DATA_ONLY"] and part.get("addOrOverrideTalentDataBundle"):
-                                candidates = part["addOrOverrideTalentDataBundle"].get("candidates", [])
-                                if candidates:
-                                    cand = candidates[-1]
-                                    desc_template = cand.get("upgradeDescription")
-                                    if desc_template:
-                                        # Merge attribute blackboard with candidate blackboard
-                                        cand_blackboard = {item["key"]: item["value"] for item in cand.get("blackboard", [])} if cand.get("blackboard") else {}
-                                        combined_blackboard = {**base_blackboard, **cand_blackboard}
-                                        talent_up = replace_description_placeholders(clean_markup(desc_template), combined_blackboard)
-
-                        module_levels.append(ModuleLevel(
-                            level=lvl,
-                            attributes=attrs,
-                            trait_upgrade=trait_up,
-                            talent_upgrade=talent_up
-                        ))
-
-                operator_modules.append(Module(
-                    moduleId=equip_id,
-                    name=equip_info["uniEquipName"],
-                    description=equip_info.get("uniEquipDesc"),
-                    typeIcon=equip_info["typeIcon"],
-                    typeName=equip_info["typeName1"] + ("-" + equip_info["typeName2"] if equip_info.get("typeName2") else ""),
-                    levels=module_levels
-                ))
-        char_info["modules"] = operator_modules
-        
-        # --- Add Potential Info ---
-        operator_potentials = []
-        if char_info.get("potentialRanks"):
-            for i, potential_rank in enumerate(char_info["potentialRanks"]):
-                if potential_rank and potential_rank.get("description"):
-                    rank_str = f"潜能{i + 2}"
-                    operator_potentials.append(PotentialInfo(rank=rank_str, description=clean_markup(potential_rank["description"])))
-        char_info["potentials"] = operator_potentials
-
-        temp_operators_data.append(char_info)
+        # Gather every operator's inputs before building, since building consumes the entries
+        operator_sources = {}
+        skill_count = module_count = 0
+        for char_id, char_info in character_data.items():
+            # Enhanced filtering to exclude tokens and non-characters
+            if not isinstance(char_info, dict): continue
+            sub_prof = char_info.get("subProfessionId", "")
+            if sub_prof == "notchar" or sub_prof.startswith("notchar"): continue
+            if char_info.get("profession") == "TOKEN": continue
+            operator_sources[char_id] = collect_operator_sources(char_id, char_info, tables)
+            skill_count += len(char_info.get("skills") or [])
+            module_count += len(char_modules_map.get(char_id, []))
+        stage["counts"] = {"operators": len(operator_sources), "skills": skill_count, "modules": module_count}
+
+    previous_fingerprints = previous.get("fingerprints", {}) if previous else {}
+    previous_records = {op["charId"]: op for op in previous["operators"]} if previous_fingerprints else {}
+
+    with report.stage("fingerprint"):
+        fingerprints = {char_id: fingerprint_operator_sources(sources) for char_id, sources in operator_sources.items()}
+    pending = [
+        (char_id, sources) for char_id, sources in operator_sources.items()
+        if fingerprints[char_id] != previous_fingerprints.get(char_id)
+    ]
+
+    # Skills and modules are only rendered when first requested, so building a record means
+    # computing its attributes and stat table, its tokens and parsing its handbook entry
+    with report.stage("build") as stage:
+        if BUILD_WORKERS > 1 and len(pending) > BUILD_CHUNK_SIZE:
+            built_records = build_operators_parallel(pending, BUILD_WORKERS, BUILD_CHUNK_SIZE)
+        else:
+            built_records = {char_id: build_operator(char_id, sources) for char_id, sources in pending}
+        stage["counts"] = {
+            "rebuilt": len(built_records),
+            "handbooks": sum(1 for _, sources in pending if (sources["handbook"] or {}).get("storyTextAudio")),
+        }
+
+    # Assemble in roster order, whichever way the records were built
+    with report.stage("assemble") as stage:
+        compactor = RecordCompactor()
+        temp_operators_data = []
+        added, changed = [], []
+        stat_table_bytes = 0
+        for char_id in operator_sources:
+            if char_id in built_records:
+                record = compactor.compact(built_records[char_id])
+                if previous_fingerprints:
+                    (changed if char_id in previous_fingerprints else added).append(char_id)
+            else:
+                record = previous_records[char_id]
+
+            if record["statTable"]:
+                stat_table_bytes += record["statTable"].nbytes
+            temp_operators_data.append(record)
+        stage["counts"] = {"reused": len(temp_operators_data) - len(built_records)}
+
+    if previous_fingerprints:
+        changes = {
+            "added": added,
+            "changed": changed,
+            "removed": [char_id for char_id in previous_fingerprints if char_id not in fingerprints],
+            "rebuilt": len(added) + len(changed),
+            "reused": len(temp_operators_data) - len(added) - len(changed),
+        }
+        print(f"Rebuilt {changes['rebuilt']} of {len(temp_operators_data)} operators "
+              f"({len(added)} added, {len(changed)} changed, {len(changes['removed'])} removed).")
+    else:
+        changes = None
+        print(f"Built {len(temp_operators_data)} operators.")
+    record_bytes = deep_sizeof(temp_operators_data)
+    print(f"Operator records: {record_bytes / 1024:.1f} KiB ({record_bytes / max(1, len(temp_operators_data)) / 1024:.1f} KiB per operator), "
+          f"stat tables {stat_table_bytes / 1024:.1f} KiB.")
+    return temp_operators_data, temp_nation_map, temp_subpro_map, fingerprints, changes
+
+def load_table(report: LoadReport, path: Path) -> dict:
+    """Parses one cached source table, measured as a `parse` stage of `report`."""
+    with report.stage("parse", path.name) as stage, open(path, 'r', encoding='utf-8') as f:
+        stage["bytesRead"] = os.fstat(f.fileno()).st_size
+        return json.load(f)
+
+def build_operators_parallel(pending: List[Tuple[str, dict]], workers: int, chunk_size: int) -> Dict[str, dict]:
+    """
+    Builds the records of `pending` on a process pool, `chunk_size` operators per work unit.
+    Each unit carries only its operators' source entries. Returns the records by charId.
+    """
+    global last_parallel_build
+    started = time.perf_counter()
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    built_records = {}
+    chunk_cpu_seconds = 0.0
+    # Spawned workers: the loader runs next to server threads, which forking does not mix well with
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        for records, chunk_seconds in executor.map(_build_chunk, chunks):
+            built_records.update(records)
+            chunk_cpu_seconds += chunk_seconds
+    wall_seconds = time.perf_counter() - started
+
+    # The summed chunk CPU time only estimates the serial build: workers contending for cores
+    # or memory bandwidth run each chunk slower than the serial loop would, inflating the estimate
+    last_parallel_build = {
+        "workers": workers,
+        "chunks": len(chunks),
+        "wallSeconds": wall_seconds,
+        "chunkCpuSeconds": chunk_cpu_seconds,
+        "estimatedSpeedup": chunk_cpu_seconds / wall_seconds if wall_seconds else 0.0,
+    }
+    print(f"Parallel build: {len(pending)} operators in {len(chunks)} chunks on {workers} workers, "
+          f"{wall_seconds:.3f}s ({chunk_cpu_seconds:.3f}s CPU in chunks, estimated {last_parallel_build['estimatedSpeedup']:.2f}x).")
+    return built_records
+
+def _build_chunk(chunk: List[Tuple[str, dict]]) -> Tuple[Dict[str, dict], float]:
+    # CPU time rather than wall time, so waiting for a core is not counted
+    started = time.process_time()
+    records = {char_id: build_operator(char_id, sources) for char_id, sources in chunk}
+    return records, time.process_time() - started
+
+def collect_operator_sources(char_id: str, char_info: dict, tables: Dict[str, dict]) -> dict:
+    """
+    Gathers every source table entry that the record of `char_id` is built from: its
+    character entry (favor key frames included), token entries, skills, modules and handbook.
+    """
+    tokens = {}
+    skills = {}
+    for skill_ref in char_info.get("skills") or []:
+        token_id = skill_ref.get("overrideTokenKey")
+        if token_id and token_id in tables["character"]:
+            tokens[token_id] = tables["character"][token_id]
+        skill_id = skill_ref.get("skillId")
+        if skill_id and skill_id in tables["skill"]:
+            skills[skill_id] = tables["skill"][skill_id]
+
+    modules = [
+        (equip_info, tables["battle_equip"].get(equip_info["uniEquipId"]))
+        for equip_info in tables["modules"].get(char_id, [])
+    ]
+
+    return {
+        "character": char_info,
+        "tokens": tokens,
+        "handbook": tables["handbook"].get(char_id),
+        # Skills and modules are only needed encoded: they are fingerprinted and packed as is
+        "details": encode_detail_sources(char_info.get("skills"), skills, modules),
+    }
+
+def fingerprint_operator_sources(sources: dict) -> str:
+    entries = {key: value for key, value in sources.items() if key != "details"}
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(entries, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    digest.update(sources["details"])
+    return digest.hexdigest()
+
+def build_operator(char_id: str, sources: dict) -> dict:
+    """Builds the final record of one operator from the entries gathered by `collect_operator_sources`."""
+    # Shallow copy, so the source entry stays exactly as it was fingerprinted
+    char_info = dict(sources["character"])
+    char_info["charId"] = char_id
+    char_info["description"] = clean_markup(char_info.get("description"))
     
-    db.load_data(temp_operators_data, temp_nation_map, temp_subpro_map)
-    print(f"Data loaded successfully. {len(temp_operators_data)} operators.")
\ No newline at end of file
+    # --- Calculate Max Stats ---
+    final_phase = char_info["phases"][-1]
+    max_level_stats = final_phase["attributesKeyFrames"][-1]["data"]
+    
+    trust_stats = {"maxHp": 0, "atk": 0, "def": 0, "magicResistance": 0}
+    if char_info.get("favorKeyFrames"):
+        favor_frame = char_info["favorKeyFrames"][-1]["data"]
+        trust_stats.update(favor_frame)
+
+    # Base stats at max level
+    final_stats = {
+        "maxHp": max_level_stats["maxHp"] + trust_stats["maxHp"],
+        "atk": max_level_stats["atk"] + trust_stats["atk"],
+        "def": max_level_stats["def"] + trust_stats["def"],
+        "magicResistance": max_level_stats["magicResistance"] + trust_stats["magicResistance"],
+        "cost": max_level_stats["cost"],
+        "blockCnt": max_level_stats["blockCnt"],
+        "moveSpeed": max_level_stats["moveSpeed"],
+        "attackSpeed": max_level_stats["attackSpeed"],
+        "baseAttackTime": max_level_stats["baseAttackTime"],
+        "respawnTime": max_level_stats["respawnTime"]
+    }
+
+    # Add potential bonuses
+    for pot in char_info.get("potentialRanks", []):
+        if pot["buff"]:
+            attr_type = pot["buff"]["attributes"]["attributeModifiers"][0]["attributeType"]
+            value = pot["buff"]["attributes"]["attributeModifiers"][0]["value"]
+            if attr_type == 0: final_stats["maxHp"] += value
+            elif attr_type == 1: final_stats["atk"] += value
+            elif attr_type == 2: final_stats["def"] += value
+            elif attr_type == 3: final_stats["magicResistance"] += value
+            elif attr_type == 21: final_stats["cost"] -= value
+            elif attr_type == 22: final_stats["blockCnt"] += value
+            elif attr_type == 23: final_stats["respawnTime"] -= value
+
+    char_info["attributes"] = CharacterAttributes(def_=final_stats.pop("def"), **final_stats)
+
+    # --- Precompute Stat Table for calculate_attributes ---
+    char_info["statTable"] = build_stat_table(char_info)
+
+    # --- Add Handbook Info ---
+    handbook_info = sources["handbook"]
+    if handbook_info and handbook_info.get("storyTextAudio"):
+        story_text = handbook_info["storyTextAudio"][0]["stories"][0]["storyText"]
+        parsed_info = parse_handbook_info(story_text)
+        char_info.update(parsed_info)
+
+    # --- Add Token Info ---
+    # Built eagerly, name search needs the token names of every operator
+    char_info["tokens"] = build_tokens(char_info.pop("skills", None), sources["tokens"])
+
+    # --- Skills, Modules & Potentials ---
+    # Built on first use (see app.core.details); the record keeps their packed source entries
+    char_info["detailSources"] = pack_detail_sources(sources["details"])
+
+    return char_info
@@ -1,3 +1,5 @@
+import sys
+from array import array
 from typing import List, Dict, Optional
 from app.models import CharacterAttributes
 from app.config import PROFESSION_MAP, POSITION_MAP
@@ -41,7 +43,81 @@ def validate_calculation_params(char_info: dict, elite: int = None, level: int =
         if potential > len(potential_ranks):
              raise ValueError(f"Operator '{operator_name}' does not have {potential} potential levels. Max potential upgrade count is {len(potential_ranks)}.")
 
+# Stat layout shared by the precomputed tables and the attribute builder
+BASE_STAT_KEYS = ("maxHp", "atk", "def", "magicResistance", "cost", "blockCnt", "moveSpeed", "attackSpeed", "baseAttackTime", "respawnTime")
+BASE_STAT_DEFAULTS = (0, 0, 0, 0.0, 0, 0, 1.0, 100.0, 1.0, 0)
+TRUST_STAT_KEYS = ("maxHp", "atk", "def", "magicResistance")
+TRUST_STAT_DEFAULTS = (0, 0, 0, 0.0)
+POTENTIAL_STAT_KEYS = ("maxHp", "atk", "def", "magicResistance", "cost", "blockCnt", "respawnTime", "attackSpeed")
+POTENTIAL_ATTRIBUTE_TYPES = {0: "maxHp", 1: "atk", 2: "def", 3: "magicResistance", 21: "cost", 22: "blockCnt", 23: "respawnTime", 7: "attackSpeed"}
+MAX_TRUST_BONUS = 100
+
+class StatTable:
+    """
+    Dense stat lookup table precomputed for one operator at load time.
+    Holds the interpolated base stats for every (elite, level), the trust bonus for
+    every trust point 0-100 and the cumulative potential bonus for every potential,
+    so calculate_attributes only needs a few array reads and additions.
+    """
+    __slots__ = ("max_levels", "base", "trust", "potential", "potential_count")
+
+    def __init__(self, char_info: dict):
+        phases = char_info.get("phases", [])
+        favor_frames = char_info.get("favorKeyFrames", [])
+        potential_ranks = char_info.get("potentialRanks", [])
+
+        self.max_levels = [phase.get("maxLevel", 1) for phase in phases]
+        self.base = []
+        for phase, max_level in zip(phases, self.max_levels):
+            rows = array("d")
+            for level in range(1, max_level + 1):
+                rows.extend(_base_stats(phase, level))
+            self.base.append(rows)
+
+        self.trust = array("d")
+        for trust in range(MAX_TRUST_BONUS + 1):
+            self.trust.extend(_trust_stats(favor_frames, trust))
+
+        self.potential_count = len(potential_ranks)
+        self.potential = array("d")
+        for potential in range(self.potential_count + 1):
+            self.potential.extend(potential_stats(potential_ranks, potential))
+
+    @property
+    def nbytes(self) -> int:
+        arrays = self.base + [self.trust, self.potential]
+        return sys.getsizeof(self) + sys.getsizeof(self.base) + sys.getsizeof(self.max_levels) + sum(sys.getsizeof(a) for a in arrays)
+
+    def lookup(self, elite: int = None, level: int = None, trust: int = 100, potential: int = 5) -> CharacterAttributes:
+        max_elite = len(self.max_levels) - 1
+        if elite is None:
+            elite = max_elite
+        elite = max(0, min(elite, max_elite))
+        max_level_in_phase = self.max_levels[elite]
+
+        if level is None:
+            level = max_level_in_phase
+        level = max(1, min(level, max_level_in_phase))
+
+        base_offset = (level - 1) * len(BASE_STAT_KEYS)
+        trust_offset = max(0, min(trust, MAX_TRUST_BONUS)) * len(TRUST_STAT_KEYS)
+        potential_offset = max(0, min(potential, self.potential_count)) * len(POTENTIAL_STAT_KEYS)
+        return _build_attributes(
+            self.base[elite][base_offset:base_offset + len(BASE_STAT_KEYS)],
+            self.trust[trust_offset:trust_offset + len(TRUST_STAT_KEYS)],
+            self.potential[potential_offset:potential_offset + len(POTENTIAL_STAT_KEYS)]
+        )
+
+def build_stat_table(char_info: dict) -> Optional[StatTable]:
+    if not char_info.get("phases"):
+        return None
+    return StatTable(char_info)
+
 def calculate_attributes(char_info: dict, elite: int = None, level: int = None, trust: int = 100, potential: int = 5) -> CharacterAttributes:
+    table = char_info.get("statTable")
+    if table is not None:
+        return table.lookup(elite, level, trust, potential)
+
     phases = char_info.get("phases", [])
     if not phases:
         return None
@@ -58,8 +134,16 @@ def calculate_attributes(char_info: dict, elite: int = None, level: int = None,
     
     level = max(1, min(level, max_level_in_phase))
 
+    potential_ranks = char_info.get("potentialRanks", [])
+    return _build_attributes(
+        _base_stats(current_phase, level),
+        _trust_stats(char_info.get("favorKeyFrames", []), trust),
+        potential_stats(potential_ranks, max(0, min(potential, len(potential_ranks))))
+    )
+
+def _base_stats(phase: dict, level: int) -> tuple:
     # 1. Base Attributes (Interpolation)
-    key_frames = current_phase.get("attributesKeyFrames", [])
+    key_frames = phase.get("attributesKeyFrames", [])
     base_stats = {}
     
     if not key_frames:
@@ -90,11 +174,13 @@ def calculate_attributes(char_info: dict, elite: int = None, level: int = None,
                 else:
                     base_stats[key] = val_lower
 
+    return tuple(base_stats.get(key, default) for key, default in zip(BASE_STAT_KEYS, BASE_STAT_DEFAULTS))
+
+def _trust_stats(favor_frames: list, trust: int) -> tuple:
     # 2. Trust Bonus (Interpolation 0-100)
     trust_stats = {"maxHp": 0, "atk": 0, "def": 0, "magicResistance": 0}
-    favor_frames = char_info.get("favorKeyFrames", [])
     if favor_frames:
-        calc_trust = max(0, min(trust, 100))
+        calc_trust = max(0, min(trust, MAX_TRUST_BONUS))
         lower_f = favor_frames[0]
         upper_f = favor_frames[-1]
         
@@ -109,44 +195,39 @@ def calculate_attributes(char_info: dict, elite: int = None, level: int = None,
              trust_stats = lower_f["data"]
         else:
             ratio = (calc_trust - lower_f["level"]) / (upper_f["level"] - lower_f["level"])
-            for key in ["maxHp", "atk", "def", "magicResistance"]:
+            for key in TRUST_STAT_KEYS:
                 val_l = lower_f["data"].get(key, 0)
                 val_u = upper_f["data"].get(key, 0)
                 trust_stats[key] = val_l + (val_u - val_l) * ratio
 
-    # 3. Potential Bonus
-    pot_stats = {"maxHp": 0, "atk": 0, "def": 0, "magicResistance": 0, "cost": 0, "blockCnt": 0, "respawnTime": 0, "attackSpeed": 0}
-    potential_ranks = char_info.get("potentialRanks", [])
-    valid_potential_idx = max(0, min(potential, len(potential_ranks)))
-    
-    for i in range(valid_potential_idx):
+    return tuple(trust_stats.get(key, default) for key, default in zip(TRUST_STAT_KEYS, TRUST_STAT_DEFAULTS))
+
+def potential_stats(potential_ranks: list, count: int) -> tuple:
+    # 3. Potential Bonus (cumulative over the first `count` ranks)
+    pot_stats = dict.fromkeys(POTENTIAL_STAT_KEYS, 0)
+    for i in range(count):
         pot = potential_ranks[i]
         if pot["buff"]:
             for mod in pot["buff"]["attributes"]["attributeModifiers"]:
-                attr_type = mod["attributeType"]
-                value = mod["value"]
-                if attr_type == 0: pot_stats["maxHp"] += value
-                elif attr_type == 1: pot_stats["atk"] += value
-                elif attr_type == 2: pot_stats["def"] += value
-                elif attr_type == 3: pot_stats["magicResistance"] += value
-                elif attr_type == 21: pot_stats["cost"] += value
-                elif attr_type == 22: pot_stats["blockCnt"] += value
-                elif attr_type == 23: pot_stats["respawnTime"] += value
-                elif attr_type == 7: pot_stats["attackSpeed"] += value
+                key = POTENTIAL_ATTRIBUTE_TYPES.get(mod["attributeType"])
+                if key:
+                    pot_stats[key] += mod["value"]
 
+    return tuple(pot_stats[key] for key in POTENTIAL_STAT_KEYS)
+
+def _build_attributes(base, trust, pot) -> CharacterAttributes:
+    # Positions follow BASE_STAT_KEYS, TRUST_STAT_KEYS and POTENTIAL_STAT_KEYS
     final_stats = {
-        "maxHp": int(base_stats.get("maxHp", 0) + trust_stats.get("maxHp", 0) + pot_stats["maxHp"]),
-        "atk": int(base_stats.get("atk", 0) + trust_stats.get("atk", 0) + pot_stats["atk"]),
-        "def": int(base_stats.get("def", 0) + trust_stats.get("def", 0) + pot_stats["def"]),
-        "magicResistance": base_stats.get("magicResistance", 0.0) + trust_stats.get("magicResistance", 0.0) + pot_stats["magicResistance"],
-        "cost": int(base_stats.get("cost", 0) + pot_stats["cost"]),
-        "blockCnt": int(base_stats.get("blockCnt", 0) + pot_stats["blockCnt"]),
-        "moveSpeed": base_stats.get("moveSpeed", 1.0),
-        "attackSpeed": base_stats.get("attackSpeed", 100.0) + pot_stats["attackSpeed"],
-        "baseAttackTime": base_stats.get("baseAttackTime", 1.0),
-        "respawnTime": int(base_stats.get("respawnTime", 0) + pot_stats["respawnTime"])
+        "maxHp": int(base[0] + trust[0] + pot[0]),
+        "atk": int(base[1] + trust[1] + pot[1]),
+        "def": int(base[2] + trust[2] + pot[2]),
+        "magicResistance": base[3] + trust[3] + pot[3],
+        "cost": int(base[4] + pot[4]),
+        "blockCnt": int(base[5] + pot[5]),
+        "moveSpeed": base[6],
+        "attackSpeed": base[7] + pot[7],
+        "baseAttackTime": base[8],
+        "respawnTime": int(base[9] + pot[6])
     }
     
     return CharacterAttributes(**final_stats)
-
-
@@ -0,0 +1,147 @@
+import gc
+import sys
+from array import array
+from typing import Any, Dict, List, Optional
+from app.core.logic import BASE_STAT_KEYS, TRUST_STAT_KEYS
+
+# Fields of the built operator dict that the endpoints and calculate_attributes read
+RESPONSE_FIELDS = (
+    "charId", "name", "description", "canUseGeneralPotentialItem", "potentialItemId",
+    "nationId", "groupId", "teamId", "displayNumber", "appellation", "position", "tagList",
+    "itemUsage", "itemDesc", "itemObtainApproach", "isNotObtainable", "isSpChar",
+    "maxPotentialLevel", "rarity", "profession", "subProfessionId", "gender", "birth_place", "race",
+    "attributes", "tokens",
+)
+STAT_SOURCE_FIELDS = ("phases", "favorKeyFrames", "potentialRanks", "statTable")
+DETAIL_SOURCE_FIELDS = ("detailSources",)
+# Built on first use by app.core.details; not written to the processed snapshot
+MEMOIZED_FIELDS = ("skills", "modules", "potentials")
+
+# Short, highly repeated values shared through sys.intern
+INTERNED_FIELDS = (
+    "nationId", "groupId", "teamId", "position", "itemObtainApproach", "rarity",
+    "profession", "subProfessionId", "gender", "birth_place", "race", "potentialItemId",
+)
+
+class OperatorRecord:
+    """
+    Compact, slotted operator record: only the fields the endpoints, the indexes and
+    calculate_attributes read, with keyframes stripped down to the stat keys.
+    Supports the read/write dict access the rest of the code uses (`op["charId"]`,
+    `op.get(...)`, `"skills" in op`), and response models validate it by attribute.
+    A field that was missing from the source dict stays unset, just like a missing key.
+    """
+    __slots__ = RESPONSE_FIELDS + STAT_SOURCE_FIELDS + DETAIL_SOURCE_FIELDS + MEMOIZED_FIELDS
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any):
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return hasattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def copy(self) -> "OperatorRecord":
+        """Shallow copy, for responses that add per-request fields."""
+        clone = object.__new__(OperatorRecord)
+        for field in OperatorRecord.__slots__:
+            if hasattr(self, field):
+                setattr(clone, field, getattr(self, field))
+        return clone
+
+    def __getstate__(self):
+        # Memoized details are rebuilt on demand rather than stored in the snapshot
+        return None, {field: getattr(self, field) for field in OperatorRecord.__slots__
+                      if field not in MEMOIZED_FIELDS and hasattr(self, field)}
+
+class RecordCompactor:
+    """
+    Turns built operator dicts into OperatorRecords for one build, interning repeated
+    strings and sharing identical tag lists, keyframes and stat table arrays between records.
+    """
+    def __init__(self):
+        self._shared: Dict[Any, Any] = {}
+
+    def compact(self, op: dict) -> OperatorRecord:
+        record = OperatorRecord()
+        for field in RESPONSE_FIELDS + DETAIL_SOURCE_FIELDS:
+            if field in op:
+                setattr(record, field, op[field])
+        for field in INTERNED_FIELDS:
+            value = record.get(field)
+            if isinstance(value, str):
+                setattr(record, field, sys.intern(value))
+        if isinstance(record.get("tagList"), list):
+            tags = tuple(sys.intern(tag) if isinstance(tag, str) else tag for tag in record.tagList)
+            record.tagList = self._shared.setdefault(("tags", tags), tags)
+
+        if "phases" in op:
+            record.phases = [self._compact_phase(phase) for phase in op["phases"]]
+        if "favorKeyFrames" in op:
+            favor_frames = op["favorKeyFrames"]
+            record.favorKeyFrames = [self._compact_frame(frame, TRUST_STAT_KEYS) for frame in favor_frames] if favor_frames else favor_frames
+        if "potentialRanks" in op:
+            record.potentialRanks = [self._compact_potential(rank) for rank in op["potentialRanks"]]
+        if "statTable" in op:
+            table = op["statTable"]
+            if table is not None:
+                table.trust = self._share_array(table.trust)
+                table.potential = self._share_array(table.potential)
+            record.statTable = table
+        return record
+
+    def _share_array(self, values: array) -> array:
+        return self._shared.setdefault(("array", values.typecode, values.tobytes()), values)
+
+    def _compact_phase(self, phase: dict) -> dict:
+        compact = {}
+        if "maxLevel" in phase:
+            compact["maxLevel"] = phase["maxLevel"]
+        if "attributesKeyFrames" in phase:
+            compact["attributesKeyFrames"] = [self._compact_frame(frame, BASE_STAT_KEYS) for frame in phase["attributesKeyFrames"]]
+        return compact
+
+    def _compact_frame(self, frame: dict, keys: tuple) -> dict:
+        data = {key: frame["data"][key] for key in keys if key in frame["data"]}
+        compact = {"level": frame["level"], "data": data}
+        try:
+            # Types are part of the key so that 1 and 1.0 are not merged
+            return self._shared.setdefault(("frame", frame["level"], tuple((k, type(v), v) for k, v in data.items())), compact)
+        except TypeError:
+            return compact
+
+    def _compact_potential(self, rank: Optional[dict]) -> Optional[dict]:
+        if not rank:
+            return rank
+        buff = rank.get("buff")
+        if buff:
+            modifiers = [
+                {"attributeType": modifier["attributeType"], "value": modifier["value"]}
+                for modifier in buff["attributes"]["attributeModifiers"]
+            ]
+            buff = {"attributes": {"attributeModifiers": modifiers}}
+        compact = {"buff": buff}
+        if "description" in rank:
+            compact["description"] = rank["description"]
+        return compact
+
+def deep_sizeof(objects: List[Any]) -> int:
+    """Bytes held by `objects` and everything they reference, counting shared objects once."""
+    seen = set()
+    total = 0
+    pending = list(objects)
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, type) or type(obj).__name__ in ("module", "function", "builtin_function_or_method"):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+    return total
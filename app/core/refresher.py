@@ -0,0 +1,148 @@
+import threading
+import time
+import tracemalloc
+from typing import Callable, List, Optional
+from app.config import REFRESH_INTERVAL, STARTUP_RETRY_AFTER, TRACE_RELOAD_MEMORY, TRACE_STARTUP_MEMORY, DATA_MODE, SHARED_SNAPSHOT_POLL
+from app.core import loader
+from app.core.instrumentation import LoadReport
+from app.db.repository import db
+
+class DataRefresher:
+    """
+    Rebuilds the game data off the request path and publishes it with one atomic
+    snapshot swap. Runs every `interval` seconds on a background thread and can be
+    triggered manually; only one rebuild runs at a time.
+    """
+    def __init__(self, interval: int):
+        self.interval = interval
+        self.last_reload: Optional[dict] = None
+        self.fresh = False
+        self._rebuild_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._trigger_download = False
+        self._thread: Optional[threading.Thread] = None
+        # Called on the rebuilding thread after each reload that published new data
+        self.publish_hooks: List[Callable[[], None]] = []
+
+    def start(self, initial_load: bool = False):
+        """
+        Starts the background thread. With `initial_load`, the thread first publishes whatever
+        data is already on disk and then fetches fresh data, retrying until something is served.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(initial_load,), name="data-refresher", daemon=True)
+        self._thread.start()
+        print(f"Data refresher started (interval {self.interval}s).")
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def trigger(self, force_download: bool = False):
+        """Asks the background thread to rebuild and publish now, without waiting for it."""
+        self._trigger_download = force_download
+        self._wake.set()
+
+    @property
+    def status(self) -> str:
+        """`loading` until data is published, `degraded` while serving data not yet checked against the remote source, then `ready`."""
+        if db.version == 0:
+            return "loading"
+        return "ready" if self.fresh else "degraded"
+
+    def reload(self, force_download: bool = False, only_if_changed: bool = False, skip_download: bool = False,
+               trace_memory: bool = TRACE_RELOAD_MEMORY) -> dict:
+        """
+        Runs one rebuild on the calling thread and returns its stats. They are kept as
+        `last_reload` when the rebuild published new data or failed.
+        """
+        with self._rebuild_lock:
+            version_before = db.version
+            started_at = time.time()
+            started = time.perf_counter()
+            cpu_started = time.process_time()
+
+            # Trace allocations only for the rebuild, unless someone else is already tracing
+            own_trace = trace_memory and not tracemalloc.is_tracing()
+            if own_trace:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            report = LoadReport()
+            error = None
+            try:
+                published = loader.load_data(force_download=force_download, only_if_changed=only_if_changed,
+                                             skip_download=skip_download, report=report)
+            except Exception as e:
+                print(f"Data reload failed: {e}")
+                published = False
+                error = str(e)
+            finally:
+                current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+                # Every load stage resets the peak, so the overall one is the highest of theirs
+                peak_bytes = max(peak_bytes, report.peak_traced_bytes or 0)
+                if own_trace:
+                    tracemalloc.stop()
+
+            stats = {
+                "startedAt": started_at,
+                "durationSeconds": time.perf_counter() - started,
+                "cpuSeconds": time.process_time() - cpu_started,
+                "peakTracedBytes": peak_bytes,
+                "retainedTracedBytes": current_bytes,
+                "published": published,
+                "versionBefore": version_before,
+                "versionAfter": db.version,
+                "operators": len(db.get_all()),
+                "changes": loader.last_build_changes if published else None,
+                "parallelBuild": loader.last_parallel_build if published else None,
+                "error": error,
+            }
+            # Checks that found nothing new (hourly, or every few seconds for readers) would
+            # otherwise replace the stats of the last real rebuild
+            if published or error is not None:
+                self.last_reload = stats
+            # Fresh once the remote source was checked successfully and data is being served
+            if error is None and not skip_download and loader.last_download_error is None and db.version > 0:
+                self.fresh = True
+            if published:
+                self._run_publish_hooks(report)
+            return stats
+
+    def _run_publish_hooks(self, report: LoadReport):
+        # Measured as stages of the load that published, since they finish its work (e.g. first renders)
+        for hook in self.publish_hooks:
+            try:
+                with report.stage("publish_hook", hook.__name__):
+                    hook()
+            except Exception as e:
+                print(f"Post-publish hook {hook.__name__} failed: {e}")
+
+    def _run(self, initial_load: bool):
+        if initial_load:
+            # Serve the last good local data first, then bring it up to date
+            self.reload(skip_download=True, trace_memory=TRACE_STARTUP_MEMORY)
+            retry_delay = STARTUP_RETRY_AFTER
+            while not self._stop.is_set():
+                self.reload(only_if_changed=True, trace_memory=TRACE_STARTUP_MEMORY)
+                if self.fresh:
+                    break
+                self._stop.wait(retry_delay)
+                retry_delay = min(retry_delay * 2, self.interval)
+
+        while not self._stop.is_set():
+            triggered = self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            # Periodic runs only publish when the upstream files actually changed, and are not
+            # traced: readers poll every few seconds
+            force_download, self._trigger_download = self._trigger_download, False
+            self.reload(force_download=force_download, only_if_changed=not triggered, trace_memory=triggered)
+
+# Global Singleton; readers only follow the builder's shared snapshot, which is cheap to check often
+refresher = DataRefresher(SHARED_SNAPSHOT_POLL if DATA_MODE == "reader" else REFRESH_INTERVAL)
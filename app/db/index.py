@@ -0,0 +1,212 @@
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+from app.core.logic import BASE_STAT_KEYS
+
+# Operator fields served by the inverted index, mapped to whether their values
+# are compared case-insensitively by filter_operators.
+INDEXED_FIELDS = {
+    "charId": False,
+    "profession": True,
+    "subProfessionId": True,
+    "rarity": False,
+    "position": True,
+    "nationId": True,
+    "gender": True,
+    "birth_place": True,
+    "race": True,
+    "itemObtainApproach": True,
+    "tagList": True,
+}
+
+EMPTY_POSTING: FrozenSet[int] = frozenset()
+
+# Operator fields the API can sort by, besides the calculated attributes
+SORT_FIELDS = ("rarity", "name", "displayNumber", "charId")
+ATTRIBUTE_SORT_FIELDS = BASE_STAT_KEYS
+# Attributes that can be range-filtered
+RANGE_FIELDS = ("maxHp", "atk", "def", "magicResistance", "cost", "blockCnt", "respawnTime", "attackSpeed")
+
+class PostingTable:
+    """
+    Posting sets by key. The process that builds them looks them up as prebuilt frozensets;
+    pickled into the shared snapshot they are stored flat instead, the positions of every key
+    back to back in one int array with each key's slice bounds in a second one, so reader
+    workers map the arrays rather than each holding a set per key.
+    """
+    def __init__(self, postings: Dict[str, set]):
+        self._sets: Optional[Dict[str, FrozenSet[int]]] = {key: frozenset(positions) for key, positions in postings.items()}
+
+    def get(self, key: str) -> FrozenSet[int]:
+        if self._sets is not None:
+            return self._sets.get(key, EMPTY_POSTING)
+        slot = self._slots.get(key)
+        if slot is None:
+            return EMPTY_POSTING
+        return frozenset(self._positions[self._offsets[slot]:self._offsets[slot + 1]])
+
+    def __getstate__(self):
+        if self._sets is None:
+            return self.__dict__
+        slots: Dict[str, int] = {}
+        offsets = array("l", [0])
+        positions = array("l")
+        for slot, (key, posting) in enumerate(self._sets.items()):
+            slots[key] = slot
+            positions.extend(sorted(posting))
+            offsets.append(len(positions))
+        return {"_sets": None, "_slots": slots, "_offsets": offsets, "_positions": positions}
+
+class OperatorIndex:
+    """
+    Inverted indexes over an operator list, built once per data load.
+    Each field maps a normalized value to the set of operator positions holding it,
+    so a filter becomes an intersection of posting sets instead of a full scan.
+    """
+    def __init__(self, operators: List[dict]):
+        self.size = len(operators)
+        postings: Dict[str, Dict[str, set]] = {field: {} for field in INDEXED_FIELDS}
+
+        for pos, op in enumerate(operators):
+            for field, fold_case in INDEXED_FIELDS.items():
+                value = op.get(field)
+                if not value:
+                    continue
+                values = value if isinstance(value, (list, tuple)) else [value]
+                for item in values:
+                    if not item:
+                        continue
+                    key = item.lower() if fold_case else item
+                    postings[field].setdefault(key, set()).add(pos)
+
+        self._postings: Dict[str, PostingTable] = {field: PostingTable(values) for field, values in postings.items()}
+
+    def lookup(self, field: str, value: str) -> FrozenSet[int]:
+        """Returns the positions of operators whose `field` equals (or, for tagList, contains) `value`."""
+        key = value.lower() if INDEXED_FIELDS[field] else value
+        return self._postings[field].get(key)
+
+class NgramIndex:
+    """
+    Character n-gram index over operator and token names for substring search.
+    Names are indexed by their unigrams and bigrams; since CJK names have no word
+    boundaries and are mostly 2-4 characters long, character grams are what make
+    a substring lookup selective. The index only yields candidates: callers still
+    verify the actual substring match.
+    """
+    def __init__(self, operators: List[dict]):
+        postings: Dict[str, set] = {}
+        for pos, op in enumerate(operators):
+            names = [op.get("name")] + [token.name for token in op.get("tokens") or []]
+            for name in names:
+                if not name:
+                    continue
+                for gram in ngrams(name.lower()):
+                    postings.setdefault(gram, set()).add(pos)
+        self._postings = PostingTable(postings)
+
+    def candidates(self, query_lower: str) -> FrozenSet[int]:
+        """Returns the positions of operators that may contain `query_lower` in a name."""
+        grams = [self._postings.get(gram) for gram in query_grams(query_lower)]
+        return intersect_postings(grams)
+
+def ngrams(text: str) -> set:
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+def query_grams(query: str) -> set:
+    if len(query) < 2:
+        return {query}
+    return {query[i:i + 2] for i in range(len(query) - 1)}
+
+def intersect_postings(postings: List[FrozenSet[int]]) -> Optional[FrozenSet[int]]:
+    """
+    Intersects posting sets smallest-first, stopping as soon as the result is empty.
+    Returns None when there is nothing to intersect (i.e. no constraint).
+    """
+    if not postings:
+        return None
+    ordered = sorted(postings, key=len)
+    result = ordered[0]
+    for posting in ordered[1:]:
+        if not result:
+            break
+        result = result & posting
+    return result
+
+class AttributeRangeIndex:
+    """
+    Attribute values at the default calculation settings, one column per field sorted by
+    value with the operator positions alongside, so a range filter is two binary searches
+    and a slice. Operators without attributes are left out of every column.
+    """
+    def __init__(self, attributes: List[Optional[dict]]):
+        self._values: Dict[str, array] = {}
+        self._positions: Dict[str, array] = {}
+        for field in RANGE_FIELDS:
+            column = sorted((stats[field], pos) for pos, stats in enumerate(attributes) if stats)
+            self._values[field] = array("d", (value for value, _ in column))
+            self._positions[field] = array("l", (pos for _, pos in column))
+
+    def lookup(self, field: str, low: Optional[float] = None, high: Optional[float] = None) -> FrozenSet[int]:
+        """Returns the positions of operators whose `field` lies within [low, high]; either bound may be open."""
+        values = self._values[field]
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return frozenset(self._positions[field][start:end])
+
+class SortIndex:
+    """
+    Sort keys precomputed once per data load. For every sortable field, each operator
+    gets its rank among the field's distinct values (-1 when it has no value), so sorting
+    compares small ints instead of strings. Attributes are ranked by their values at the
+    default calculation settings (max elite and level, full potential, trust 100).
+    """
+    def __init__(self, operators: List[dict], attributes: List[Optional[dict]]):
+        self._rows = {op.get("charId"): row for row, op in enumerate(operators)}
+        self._ranks: Dict[str, array] = {}
+        for field in SORT_FIELDS:
+            self._ranks[field] = _rank([op.get(field) for op in operators])
+        for field in ATTRIBUTE_SORT_FIELDS:
+            self._ranks[field] = _rank([stats[field] if stats else None for stats in attributes])
+
+    def sort(
+        self,
+        operators: List[dict],
+        keys: Sequence[Tuple[str, bool]],
+        count: Optional[int] = None,
+        values: Optional[Dict[str, list]] = None
+    ) -> List[dict]:
+        """
+        Orders `operators` by `keys`, (field, descending) pairs. Missing values sort last
+        in either direction and ties keep data order. With `count`, only the first `count`
+        operators are selected, by partial heap selection instead of a full sort.
+        `values` replaces the precomputed ranks of some fields with raw values aligned with
+        `operators`, for attributes calculated at other settings.
+        """
+        rows = [self._rows[op.get("charId")] for op in operators]
+        columns = []
+        for field, descending in keys:
+            if values and field in values:
+                column = values[field]
+            else:
+                ranks = self._ranks[field]
+                column = [ranks[row] if ranks[row] >= 0 else None for row in rows]
+            sign = -1 if descending else 1
+            columns.append([(1, 0) if value is None else (0, sign * value) for value in column])
+        sort_keys = list(zip(*columns))
+
+        positions = range(len(operators))
+        if count is not None and count < len(operators):
+            # Documented to equal sorted(...)[:count], ties included
+            order = heapq.nsmallest(count, positions, key=sort_keys.__getitem__)
+        else:
+            order = sorted(positions, key=sort_keys.__getitem__)
+        return [operators[i] for i in order]
+
+def _rank(values: list) -> array:
+    """Each value's position among the sorted distinct values, or -1 for None."""
+    ranks = {value: rank for rank, value in enumerate(sorted({value for value in values if value is not None}))}
+    return array("l", (-1 if value is None else ranks[value] for value in values))
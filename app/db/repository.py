@@ -1,102 +1,174 @@
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, FrozenSet, Optional, Tuple, Union
 from app.config import PROFESSION_MAP, POSITION_MAP
+from app.core.batch import AttributeBatchEngine
+from app.db.index import OperatorIndex, NgramIndex, SortIndex, AttributeRangeIndex, intersect_postings
+from app.db.search import FullTextIndex
+
+# A single filter value, or several of which any may match
+Values = Union[str, List[str]]
+
+class RepositorySnapshot:
+    """
+    One complete, immutable generation of game data: the operator records, lookup maps
+    and every index built over them. Requests hold on to the snapshot they started with,
+    so a reload never changes the data underneath an in-flight request.
+    """
+    def __init__(self, operators: List[dict], nation_map: Dict[str, str], subpro_map: Dict[str, str], version: int):
+        self.operators = operators
+        self.nation_map = nation_map
+        self.subpro_map = subpro_map
+        self.version = version
+        self.by_char_id = {op["charId"]: op for op in operators}
+        self.index = OperatorIndex(operators)
+        self.name_index = NgramIndex(operators)
+        self.attribute_engine = AttributeBatchEngine(operators)
+        # Sorting and range filters on attributes use their values at the default settings
+        default_attributes = self.attribute_engine.calculate(operators)
+        self.sort_index = SortIndex(operators, default_attributes)
+        self.range_index = AttributeRangeIndex(default_attributes)
+        self.text_index = FullTextIndex(operators)
 
-class OperatorRepository:
-    def __init__(self):
-        self._operators: List[dict] = []
-        self._nation_map: Dict[str, str] = {}
-        self._subpro_map: Dict[str, str] = {}
-        
-    def load_data(self, operators: List[dict], nation_map: Dict[str, str], subpro_map: Dict[str, str]):
-        self._operators = operators
-        self._nation_map = nation_map
-        self._subpro_map = subpro_map
-        
-    def get_all(self) -> List[dict]:
-        return self._operators
-        
     def filter_operators(
         self,
         char_id: str = None,
         name: str = None,
-        profession: str = None,
-        sub_profession: str = None,
-        rarity: int = None,
-        position: str = None,
+        profession: Values = None,
+        sub_profession: Values = None,
+        rarity: Union[int, List[int]] = None,
+        position: Values = None,
         tags: List[str] = None,
-        nation: str = None,
-        gender: str = None,
-        birth_place: str = None,
-        race: str = None,
-        obtain_approach: str = None
+        nation: Values = None,
+        gender: Values = None,
+        birth_place: Values = None,
+        race: Values = None,
+        obtain_approach: Values = None,
+        attribute_ranges: Dict[str, Tuple[Optional[float], Optional[float]]] = None
     ) -> List[dict]:
-        results = self._operators
+        """
+        Operators matching every given filter, in data order. Filters that take a list
+        match an operator holding any of the values, except `tags`, which must all be present.
+        `attribute_ranges` maps attribute names to inclusive (low, high) bounds at the
+        default calculation settings; either bound may be None.
+        """
+        postings = []
 
         if char_id:
-            results = [op for op in results if op.get("charId") == char_id]
+            postings.append(self.index.lookup("charId", char_id))
 
         if name:
             name_lower = name.lower()
-            filtered_results = []
-            for op in results:
-                # Check operator name
-                if op.get("name") and name_lower in op.get("name").lower():
-                    filtered_results.append(op)
-                    continue
-                
-                # Check token names
-                # op["tokens"] holds List[Token] objects
-                if op.get("tokens"):
-                    found_token = False
-                    for token in op["tokens"]:
-                        if token.name and name_lower in token.name.lower():
-                            filtered_results.append(op)
-                            found_token = True
-                            break
-                    if found_token:
-                        continue
-            results = filtered_results
+            # Grams only narrow the candidates; the substring match is verified below
+            postings.append(self.name_index.candidates(name_lower))
 
         if profession:
-            mapped_prof = PROFESSION_MAP.get(profession, profession)
-            results = [op for op in results if op.get("profession") and op.get("profession").lower() == mapped_prof.lower()]
+            postings.append(self._lookup_any("profession", profession, PROFESSION_MAP))
         
         if sub_profession:
-            mapped_sub = self._subpro_map.get(sub_profession, sub_profession)
-            results = [op for op in results if op.get("subProfessionId") and op.get("subProfessionId").lower() == mapped_sub.lower()]
+            postings.append(self._lookup_any("subProfessionId", sub_profession, self.subpro_map))
 
         if rarity:
-            rarity_str = f"TIER_{rarity}"
-            results = [op for op in results if op.get("rarity") == rarity_str]
+            tiers = [f"TIER_{r}" for r in (rarity if isinstance(rarity, list) else [rarity])]
+            postings.append(self._lookup_any("rarity", tiers))
 
         if position:
-            mapped_pos = POSITION_MAP.get(position, position)
-            results = [op for op in results if op.get("position") and op.get("position").lower() == mapped_pos.lower()]
+            postings.append(self._lookup_any("position", position, POSITION_MAP))
 
         if tags:
-            requested_tags = [t.lower() for t in tags]
-            results = [
-                op for op in results 
-                if op.get("tagList") and all(req_tag in [t.lower() for t in op["tagList"]] for req_tag in requested_tags)
-            ]
+            for tag in tags:
+                postings.append(self.index.lookup("tagList", tag))
         
         if nation:
-            mapped_nation = self._nation_map.get(nation, nation)
-            results = [op for op in results if op.get("nationId") and op.get("nationId").lower() == mapped_nation.lower()]
+            postings.append(self._lookup_any("nationId", nation, self.nation_map))
 
         if gender:
-            results = [op for op in results if op.get("gender") and op.get("gender").lower() == gender.lower()]
+            postings.append(self._lookup_any("gender", gender))
 
         if birth_place:
-            results = [op for op in results if op.get("birth_place") and op.get("birth_place").lower() == birth_place.lower()]
+            postings.append(self._lookup_any("birth_place", birth_place))
         
         if race:
-            results = [op for op in results if op.get("race") and op.get("race").lower() == race.lower()]
+            postings.append(self._lookup_any("race", race))
         
         if obtain_approach:
-            results = [op for op in results if op.get("itemObtainApproach") and op.get("itemObtainApproach").lower() == obtain_approach.lower()]
+            postings.append(self._lookup_any("itemObtainApproach", obtain_approach))
+
+        if attribute_ranges:
+            for field, (low, high) in attribute_ranges.items():
+                postings.append(self.range_index.lookup(field, low, high))
+
+        matched = intersect_postings(postings)
+        if matched is None:
+            results = self.operators
+        else:
+            results = [self.operators[pos] for pos in sorted(matched)]
+
+        if name:
+            results = [op for op in results if self._matches_name(op, name_lower)]
         
         return results
 
+    def _lookup_any(self, field: str, values: Values, mapping: Dict[str, str] = None) -> FrozenSet[int]:
+        """Union of the postings of every value, after mapping display names to IDs."""
+        if not isinstance(values, list):
+            values = [values]
+        keys = [mapping.get(value, value) for value in values] if mapping else values
+        if len(keys) == 1:
+            return self.index.lookup(field, keys[0])
+        return frozenset().union(*(self.index.lookup(field, key) for key in keys))
+
+    @staticmethod
+    def _matches_name(op: dict, name_lower: str) -> bool:
+        # Check operator name
+        if op.get("name") and name_lower in op.get("name").lower():
+            return True
+        
+        # Check token names
+        # op["tokens"] holds List[Token] objects
+        for token in op.get("tokens") or []:
+            if token.name and name_lower in token.name.lower():
+                return True
+        return False
+
+class OperatorRepository:
+    def __init__(self):
+        self._snapshot = RepositorySnapshot([], {}, {}, 0)
+        self._version_lock = threading.Lock()
+        self._last_version = 0
+
+    def build_snapshot(self, operators: List[dict], nation_map: Dict[str, str], subpro_map: Dict[str, str]) -> RepositorySnapshot:
+        """Builds a new snapshot (indexes included) without publishing it."""
+        with self._version_lock:
+            self._last_version += 1
+            version = self._last_version
+        return RepositorySnapshot(operators, nation_map, subpro_map, version)
+
+    def advance_version(self, version: int):
+        """Makes the next built snapshot's version follow `version`."""
+        with self._version_lock:
+            self._last_version = max(self._last_version, version)
+
+    def publish(self, snapshot: RepositorySnapshot):
+        # A single reference assignment: readers see either the old or the new snapshot
+        self._snapshot = snapshot
+        
+    def load_data(self, operators: List[dict], nation_map: Dict[str, str], subpro_map: Dict[str, str]):
+        self.publish(self.build_snapshot(operators, nation_map, subpro_map))
+
+    def snapshot(self) -> RepositorySnapshot:
+        """Returns the current snapshot. Take it once per request and read only from it."""
+        return self._snapshot
+        
+    def get_all(self) -> List[dict]:
+        return self._snapshot.operators
+
+    @property
+    def version(self) -> int:
+        """Data version of the published snapshot, incremented by every load."""
+        return self._snapshot.version
+
+    def filter_operators(self, **filters) -> List[dict]:
+        return self._snapshot.filter_operators(**filters)
+
 # Global Singleton
 db = OperatorRepository()
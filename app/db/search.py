@@ -0,0 +1,140 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Sequence
+from app.core.details import build_details
+from app.db.index import PostingTable, intersect_postings, ngrams, query_grams
+
+# Kinds of text the full-text index covers
+SEARCH_KINDS = ("description", "skill", "module", "potential")
+
+# BM25 parameters, and the extra weight of a term found in a skill or module name
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 1.0
+SNIPPET_RADIUS = 24
+
+class TextDocument:
+    """One searchable text: an operator's description, one skill, one module or its potentials."""
+    __slots__ = ("charId", "name", "kind", "ownerId", "title", "text", "searchText")
+
+    def __init__(self, char_id: str, name: str, kind: str, owner_id: Optional[str], title: Optional[str], text: str):
+        self.charId = char_id
+        self.name = name
+        self.kind = kind
+        self.ownerId = owner_id
+        self.title = title
+        self.text = text
+        self.searchText = f"{title or ''}\n{text}".lower()
+
+class FullTextIndex:
+    """
+    Inverted index over the operators' descriptive texts: the description (trait), each
+    skill's name and top-level description, each module's trait and talent upgrades and
+    the potentials. Texts are indexed by character unigrams and bigrams, which is what
+    tokenizes CJK text without word boundaries; candidates are verified by substring match
+    and ranked with BM25.
+    """
+    def __init__(self, operators: List[dict]):
+        self.documents: List[TextDocument] = []
+        for op in operators:
+            self.documents.extend(operator_documents(op))
+
+        postings: Dict[str, set] = {}
+        for doc_id, document in enumerate(self.documents):
+            for gram in ngrams(document.searchText):
+                postings.setdefault(gram, set()).add(doc_id)
+        self._postings = PostingTable(postings)
+        self._average_length = sum(len(d.searchText) for d in self.documents) / len(self.documents) if self.documents else 1.0
+
+    def search(self, query: str, kinds: Optional[Sequence[str]] = None, limit: int = 20) -> List[dict]:
+        """
+        Documents containing every whitespace-separated term of `query`, best first,
+        as dicts with the owning operator, skill or module and a snippet around the first match.
+        """
+        terms = list(dict.fromkeys(query.lower().split()))
+        if not terms:
+            return []
+
+        term_postings = []
+        for term in terms:
+            grams = [self._postings.get(gram) for gram in query_grams(term)]
+            term_postings.append(intersect_postings(grams))
+        candidates = intersect_postings(term_postings)
+
+        total = len(self.documents)
+        idf = [math.log(1 + (total - len(p) + 0.5) / (len(p) + 0.5)) for p in term_postings]
+        scored = []
+        for doc_id in candidates:
+            document = self.documents[doc_id]
+            if kinds and document.kind not in kinds:
+                continue
+            text = document.searchText
+            if not all(term in text for term in terms):
+                continue
+            scored.append((-self._score(document, terms, idf), doc_id))
+
+        hits = []
+        for negative_score, doc_id in heapq.nsmallest(limit, scored):
+            document = self.documents[doc_id]
+            hits.append({
+                "charId": document.charId,
+                "name": document.name,
+                "kind": document.kind,
+                "skillId": document.ownerId if document.kind == "skill" else None,
+                "moduleId": document.ownerId if document.kind == "module" else None,
+                "title": document.title,
+                "snippet": snippet(document, terms),
+                "score": round(-negative_score, 4),
+            })
+        return hits
+
+    def _score(self, document: TextDocument, terms: List[str], idf: List[float]) -> float:
+        text = document.searchText
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * len(text) / self._average_length)
+        title = (document.title or "").lower()
+        score = 0.0
+        for term, weight in zip(terms, idf):
+            tf = text.count(term)
+            score += weight * tf * (BM25_K1 + 1) / (tf + norm)
+            if term in title:
+                score += weight * TITLE_WEIGHT
+        return score
+
+def operator_documents(op: dict) -> List[TextDocument]:
+    # Details already built for a request are reused; the rest are built without being kept
+    fields = ("skills", "modules", "potentials")
+    details = build_details(op, [field for field in fields if field not in op])
+    skills, modules, potentials = (op[field] if field in op else details[field] for field in fields)
+
+    char_id, name = op["charId"], op["name"]
+    documents = []
+    if op.get("description"):
+        documents.append(TextDocument(char_id, name, "description", None, None, op["description"]))
+    for skill in skills or []:
+        if skill.levels:
+            top = skill.levels[-1]
+            documents.append(TextDocument(char_id, name, "skill", skill.skillId, top.name, top.description or ""))
+    for module in modules or []:
+        upgrades = []
+        for level in module.levels:
+            for text in (level.trait_upgrade, level.talent_upgrade):
+                if text and text not in upgrades:
+                    upgrades.append(text)
+        if upgrades:
+            documents.append(TextDocument(char_id, name, "module", module.moduleId, module.name, "\n".join(upgrades)))
+    if potentials:
+        text = "\n".join(f"{potential.rank}: {potential.description}" for potential in potentials)
+        documents.append(TextDocument(char_id, name, "potential", None, None, text))
+    return documents
+
+def snippet(document: TextDocument, terms: List[str]) -> str:
+    """The text around the earliest match of any term, or the start of the text if only the title matched."""
+    text = document.text
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in terms]
+    positions = [pos for pos in positions if pos >= 0]
+    if not positions:
+        return text[:2 * SNIPPET_RADIUS] + ("…" if len(text) > 2 * SNIPPET_RADIUS else "")
+    start = max(0, min(positions) - SNIPPET_RADIUS)
+    end = min(len(text), min(positions) + SNIPPET_RADIUS * 2)
+    return ("…" if start > 0 else "") + text[start:end] + ("…" if end < len(text) else "")
@@ -0,0 +1,108 @@
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+from array import array
+from pathlib import Path
+from typing import Optional, Tuple
+from app.db.repository import RepositorySnapshot
+
+# Layout: MAGIC | header length (u64) | JSON header | buffers (64-byte aligned) | pickle
+MAGIC = b"AKSNAPv1"
+ALIGNMENT = 64
+
+class _SharedPickler(pickle.Pickler):
+    # array.array (stat tables, sort ranks, range columns, postings) has no out-of-band
+    # pickling of its own; numpy arrays do
+    def reducer_override(self, obj):
+        if type(obj) is array:
+            return _array_view, (obj.typecode, pickle.PickleBuffer(obj))
+        return NotImplemented
+
+def _array_view(typecode: str, buffer) -> memoryview:
+    # Indexes and slices like the array it replaces, straight from the mapped pages
+    return memoryview(buffer).cast("B").cast(typecode)
+
+def write_shared_snapshot(snapshot: RepositorySnapshot, path: Path, code: str):
+    """
+    Writes `snapshot` (records, indexes and the batch engine) as a memory-mappable file.
+    Numeric arrays are stored out-of-band, aligned, so that readers map them zero-copy
+    and every worker shares the same physical pages. Everything else (records, documents,
+    dict keys) is unpickled by each reader into its own memory. Replaces `path` atomically.
+    """
+    buffers = []
+    stream = io.BytesIO()
+    _SharedPickler(stream, protocol=5, buffer_callback=buffers.append).dump(snapshot)
+    payload = stream.getbuffer()
+
+    raws = [buffer.raw() for buffer in buffers]
+    header = {"version": snapshot.version, "code": code, "buffers": [], "pickle": None}
+    # The header size depends on the offsets it lists, so lay out with a generous fixed budget
+    header_budget = _align(len(MAGIC) + 8 + 256 + 48 * len(raws))
+    offset = header_budget
+    for raw in raws:
+        header["buffers"].append([offset, raw.nbytes])
+        offset = _align(offset + raw.nbytes)
+    header["pickle"] = [offset, len(payload)]
+    encoded_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    if len(MAGIC) + 8 + len(encoded_header) > header_budget:
+        raise ValueError("shared snapshot header does not fit its budget")
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(encoded_header)))
+        f.write(encoded_header)
+        for (buffer_offset, _), raw in zip(header["buffers"], raws):
+            f.seek(buffer_offset)
+            f.write(raw)
+        f.seek(header["pickle"][0])
+        f.write(payload)
+    # Readers still holding the previous file keep their mapping after the replace
+    os.replace(tmp_path, path)
+
+def read_shared_header(path: Path) -> Optional[dict]:
+    try:
+        with open(path, 'rb') as f:
+            return _read_header(f)
+    except (OSError, ValueError):
+        return None
+
+def read_shared_snapshot(path: Path, code: str) -> Optional[Tuple[RepositorySnapshot, tuple]]:
+    """
+    Maps the shared snapshot read-only and restores it, with its numeric arrays viewing the
+    mapped pages. Returns (snapshot, file identity), or None if there is no usable snapshot.
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with f:
+        stat = os.fstat(f.fileno())
+        try:
+            header = _read_header(f)
+        except (ValueError, struct.error) as e:
+            print(f"Ignoring unreadable shared snapshot: {e}")
+            return None
+        if header.get("code") != code:
+            print("Shared snapshot was built by a different version of the code.")
+            return None
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # The mapping stays alive as long as any view into it does
+    view = memoryview(mapped)
+    buffers = [view[offset:offset + length] for offset, length in header["buffers"]]
+    pickle_offset, pickle_length = header["pickle"]
+    snapshot = pickle.loads(view[pickle_offset:pickle_offset + pickle_length], buffers=buffers)
+    return snapshot, (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def _read_header(f) -> dict:
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a shared snapshot")
+    (length,) = struct.unpack("<Q", f.read(8))
+    return json.loads(f.read(length))
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
@@ -1,21 +1,42 @@
+import secrets
 from dataclasses import dataclass
-from typing import Optional
-from fastapi import Query
+from typing import Annotated, List, Optional
+from fastapi import HTTPException, Query, Security
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import Field
+from app.config import ADMIN_TOKEN, STARTUP_RETRY_AFTER
+from app.db.repository import db
 
 @dataclass
 class FilterParams:
     char_id: Optional[str] = Query(None, title="角色ID", description="干员的唯一标识符 (精确搜索)")
     name: Optional[str] = Query(None, title="名称", description="干员的名称 (支持模糊搜索)")
-    profession: Optional[str] = Query(None, title="职业", description="干员的职业")
-    sub_profession: Optional[str] = Query(None, title="分支", description="干员的子职业")
-    rarity: Optional[int] = Query(None, title="稀有度", ge=1, le=6, description="干员的稀有度 (1-6)")
-    position: Optional[str] = Query(None, title="位置", description="干员的位置 (MELEE or RANGED)")
-    tag: Optional[str] = Query(None, title="词缀", description="干员的标签")
-    nation: Optional[str] = Query(None, title="势力", description="干员所属的势力")
-    gender: Optional[str] = Query(None, title="性别", description="干员的性别")
-    birth_place: Optional[str] = Query(None, title="出身地", description="干员的出身地")
-    race: Optional[str] = Query(None, title="种族", description="干员的种族")
-    obtain_approach: Optional[str] = Query(None, title="获取途径", description="干员的获取途径")
+    profession: Optional[List[str]] = Query(None, title="职业", description="干员的职业 (可重复, 匹配任意一个)")
+    sub_profession: Optional[List[str]] = Query(None, title="分支", description="干员的子职业 (可重复, 匹配任意一个)")
+    rarity: Optional[List[Annotated[int, Field(ge=1, le=6)]]] = Query(None, title="稀有度", description="干员的稀有度 (1-6, 可重复, 匹配任意一个)")
+    position: Optional[List[str]] = Query(None, title="位置", description="干员的位置 (MELEE or RANGED)")
+    tag: Optional[List[str]] = Query(None, title="词缀", description="干员的标签 (可重复, 需同时具备所有标签)")
+    nation: Optional[List[str]] = Query(None, title="势力", description="干员所属的势力 (可重复, 匹配任意一个)")
+    gender: Optional[List[str]] = Query(None, title="性别", description="干员的性别")
+    birth_place: Optional[List[str]] = Query(None, title="出身地", description="干员的出身地 (可重复, 匹配任意一个)")
+    race: Optional[List[str]] = Query(None, title="种族", description="干员的种族 (可重复, 匹配任意一个)")
+    obtain_approach: Optional[List[str]] = Query(None, title="获取途径", description="干员的获取途径 (可重复, 匹配任意一个)")
+    max_hp_min: Optional[int] = Query(None, title="最低生命上限", description="生命上限下限 (含), 按默认计算设置 (满精英、满级、满信赖、满潜) 比较")
+    max_hp_max: Optional[int] = Query(None, title="最高生命上限", description="生命上限上限 (含), 按默认计算设置比较")
+    atk_min: Optional[int] = Query(None, title="最低攻击力", description="攻击力下限 (含), 按默认计算设置 (满精英、满级、满信赖、满潜) 比较")
+    atk_max: Optional[int] = Query(None, title="最高攻击力", description="攻击力上限 (含), 按默认计算设置比较")
+    def_min: Optional[int] = Query(None, title="最低防御力", description="防御力下限 (含), 按默认计算设置 (满精英、满级、满信赖、满潜) 比较")
+    def_max: Optional[int] = Query(None, title="最高防御力", description="防御力上限 (含), 按默认计算设置比较")
+    magic_resistance_min: Optional[float] = Query(None, title="最低法术抗性", description="法术抗性下限 (含), 按默认计算设置 (满精英、满级、满信赖、满潜) 比较")
+    magic_resistance_max: Optional[float] = Query(None, title="最高法术抗性", description="法术抗性上限 (含), 按默认计算设置比较")
+    cost_min: Optional[int] = Query(None, title="最低部署费用", description="部署费用下限 (含), 按默认计算设置 (满精英、满级、满信赖、满潜) 比较")
+    cost_max: Optional[int] = Query(None, title="最高部署费用", description="部署费用上限 (含), 按默认计算设置比较")
+    block_cnt_min: Optional[int] = Query(None, title="最低阻挡数", description="阻挡数下限 (含), 按默认计算设置 (满精英、满级、满信赖、满潜) 比较")
+    block_cnt_max: Optional[int] = Query(None, title="最高阻挡数", description="阻挡数上限 (含), 按默认计算设置比较")
+    respawn_time_min: Optional[int] = Query(None, title="最低再部署时间", description="再部署时间下限 (含), 按默认计算设置 (满精英、满级、满信赖、满潜) 比较")
+    respawn_time_max: Optional[int] = Query(None, title="最高再部署时间", description="再部署时间上限 (含), 按默认计算设置比较")
+    attack_speed_min: Optional[float] = Query(None, title="最低攻击速度", description="攻击速度下限 (含), 按默认计算设置 (满精英、满级、满信赖、满潜) 比较")
+    attack_speed_max: Optional[float] = Query(None, title="最高攻击速度", description="攻击速度上限 (含), 按默认计算设置比较")
 
 @dataclass
 class CalculationParams:
@@ -23,3 +44,37 @@ class CalculationParams:
     level: Optional[int] = Query(None, title="目标等级", ge=1, le=90, description="计算属性时的等级")
     potential: Optional[int] = Query(5, title="目标潜能", ge=0, le=5, description="计算属性时的潜能等级 (0-5, 0为潜能1, 5为满潜)")
     trust: Optional[int] = Query(100, title="目标信赖", ge=0, le=200, description="计算属性时的信赖值 (0-200, 属性加成100封顶)")
+
+@dataclass
+class PageParams:
+    limit: Optional[int] = Query(None, title="数量", ge=1, description="最多返回的干员数量 (默认返回全部)")
+    offset: int = Query(0, title="偏移", ge=0, description="跳过的干员数量, 与 limit 一起用于分页")
+
+@dataclass
+class SortParams:
+    sort: Optional[str] = Query(None, title="排序", description="排序字段, 以逗号分隔, 前缀 - 表示降序 (如 -rarity,name); 可用 rarity, name, displayNumber, charId 及各项属性 (如 atk, def)")
+
+@dataclass
+class ProjectionParams:
+    fields: Optional[str] = Query(None, title="字段", description="只返回这些字段, 以逗号分隔 (如 charId,name,attributes); 未选择的部分不会被计算")
+
+def require_data():
+    """Fails fast with 503 while no game data has been loaded yet, instead of serving empty results."""
+    if db.version == 0:
+        raise HTTPException(
+            status_code=503,
+            detail="Game data is still loading.",
+            headers={"Retry-After": str(STARTUP_RETRY_AFTER)}
+        )
+
+admin_bearer = HTTPBearer(auto_error=False, description="The configured ADMIN_TOKEN")
+
+def require_admin(credentials: Optional[HTTPAuthorizationCredentials] = Security(admin_bearer)):
+    """
+    Admits requests carrying the configured ADMIN_TOKEN as a bearer token. Without a configured
+    token the admin endpoints do not exist as far as clients can tell.
+    """
+    if ADMIN_TOKEN is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(credentials.credentials.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Admin token required.", headers={"WWW-Authenticate": "Bearer"})
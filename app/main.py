@@ -1,18 +1,37 @@
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from pydantic import BaseModel
-from app.core.loader import load_data
-from app.api.endpoints import operators
+from app.config import STARTUP_MODE, TRACE_STARTUP_MEMORY
+from app.core.refresher import refresher
+from app.api.endpoints import operators, search, admin
+
+# uvicorn configures only its own loggers; without this the load stage records are dropped
+app_logger = logging.getLogger("app")
+app_logger.setLevel(logging.INFO)
+if not app_logger.handlers and not logging.getLogger().handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    app_logger.addHandler(_handler)
+
+# The full roster is what most clients ask for first after a reload
+refresher.publish_hooks.append(operators.precompress_full_roster)
 
 class RootResponse(BaseModel):
     message: str
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("API starting up. Performing initial data load...")
-    load_data()
-    print("Startup data load complete.")
+    if STARTUP_MODE == "background":
+        print("API starting up. Loading data in the background...")
+        refresher.start(initial_load=True)
+    else:
+        print("API starting up. Performing initial data load...")
+        refresher.reload(trace_memory=TRACE_STARTUP_MEMORY)
+        print("Startup data load complete.")
+        refresher.start()
     yield
+    refresher.stop()
 
 app = FastAPI(
     title="Arknights Game Data API",
@@ -25,3 +44,5 @@ def read_root():
     return {"message": "欢迎使用明日方舟干员数据查询 API"}
 
 app.include_router(operators.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
@@ -1,5 +1,6 @@
 from typing import List, Optional, Dict
 from pydantic import BaseModel, Field, ConfigDict
+from app.config import BATCH_MAX_ITEMS
 
 class CharacterAttributes(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
@@ -102,3 +103,111 @@ class Operator(OperatorBase):
     skills: Optional[List[Skill]] = None
     potentials: Optional[List[PotentialInfo]] = None
     modules: Optional[List[Module]] = None
+
+class AttributesBatchItem(BaseModel):
+    charId: str
+    elite: Optional[int] = Field(None, ge=0, le=2)
+    level: Optional[int] = Field(None, ge=1, le=90)
+    potential: int = Field(5, ge=0, le=5)
+    trust: int = Field(100, ge=0, le=200)
+
+class AttributesBatchRequest(BaseModel):
+    items: List[AttributesBatchItem] = Field(max_length=BATCH_MAX_ITEMS)
+
+class AttributesBatchResult(BaseModel):
+    charId: str
+    name: Optional[str] = None
+    attributes: Optional[CharacterAttributes] = None
+    error: Optional[str] = None
+
+class SearchHit(BaseModel):
+    charId: str
+    name: str
+    kind: str
+    skillId: Optional[str] = None
+    moduleId: Optional[str] = None
+    title: Optional[str] = None
+    snippet: str
+    score: float
+
+class DataChanges(BaseModel):
+    added: List[str]
+    changed: List[str]
+    removed: List[str]
+    rebuilt: int
+    reused: int
+
+class ParallelBuildStats(BaseModel):
+    workers: int
+    chunks: int
+    wallSeconds: float
+    # Build CPU time summed over the chunks, and its ratio to wallSeconds: an estimate of the
+    # serial build time and of the speedup, not a measured serial run
+    chunkCpuSeconds: float
+    estimatedSpeedup: float
+
+class ReloadStats(BaseModel):
+    startedAt: float
+    durationSeconds: float
+    cpuSeconds: float
+    peakTracedBytes: int
+    retainedTracedBytes: int
+    published: bool
+    versionBefore: int
+    versionAfter: int
+    operators: int
+    changes: Optional[DataChanges] = None
+    parallelBuild: Optional[ParallelBuildStats] = None
+    error: Optional[str] = None
+
+class LoadStage(BaseModel):
+    name: str
+    target: Optional[str] = None
+    wallSeconds: float
+    cpuSeconds: float
+    bytesRead: Optional[int] = None
+    files: Optional[Dict[str, int]] = None
+    peakTracedBytes: Optional[int] = None
+    tracedBytesDelta: Optional[int] = None
+    counts: Optional[Dict[str, int]] = None
+
+class LoadReportResponse(BaseModel):
+    startedAt: float
+    wallSeconds: float
+    cpuSeconds: float
+    bytesRead: int
+    peakTracedBytes: Optional[int] = None
+    counts: Dict[str, int]
+    stages: List[LoadStage]
+
+class DataStatusResponse(BaseModel):
+    version: int
+    operators: int
+    lastReload: Optional[ReloadStats] = None
+
+class CacheStats(BaseModel):
+    entries: int
+    hits: int
+    misses: int
+    evictions: int
+    compressedVariants: Optional[int] = None
+    bytes: Optional[int] = None
+    maxBytes: Optional[int] = None
+    maxEntries: Optional[int] = None
+    version: Optional[int] = None
+    invalidations: Optional[int] = None
+
+class CoalescingStats(BaseModel):
+    executions: int
+    coalesced: int
+    inFlight: int
+
+class CacheStatsResponse(BaseModel):
+    responses: CacheStats
+    attributes: CacheStats
+    filters: CacheStats
+    coalescing: CoalescingStats
+
+class ReadinessResponse(BaseModel):
+    status: str
+    version: int
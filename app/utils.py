@@ -1,46 +1,77 @@
 import re
+from functools import lru_cache
+
+MARKUP_PATTERN = re.compile(r'<[^>]*>')
+# Matches single braces like {key} or {key:fmt}
+PLACEHOLDER_PATTERN = re.compile(r'\{([a-zA-Z0-9_\.@\[\]]+)(?::([^{}]+))?}')
+PRECISION_PATTERN = re.compile(r'\.(\d+)')
+
+# Placeholder kinds in a compiled template
+PLAIN, PERCENT, FORMATTED = 0, 1, 2
 
 def clean_markup(text: str | None) -> str | None:
     if text is None:
         return None
-    return re.sub(r'<[^>]*>', '', text)
+    if '<' not in text:
+        return text
+    return MARKUP_PATTERN.sub('', text)
+
+@lru_cache(maxsize=8192)
+def compile_description(description: str) -> tuple:
+    """
+    Parses a description template once into literal strings and
+    (key, original text, kind, format spec) placeholders, with `%` precisions resolved.
+    Skill levels and module phases mostly share their template text, so this is cached.
+    """
+    segments = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(description):
+        if match.start() > position:
+            segments.append(description[position:match.start()])
+        full_key, format_spec = match.group(1), match.group(2)
+        if not format_spec:
+            segments.append((full_key, match.group(0), PLAIN, None))
+        elif '%' in format_spec:
+            precision_match = PRECISION_PATTERN.search(format_spec)
+            precision = int(precision_match.group(1)) if precision_match else 0
+            segments.append((full_key, match.group(0), PERCENT, f".{precision}f"))
+        else:
+            segments.append((full_key, match.group(0), FORMATTED, format_spec))
+        position = match.end()
+    if position < len(description):
+        segments.append(description[position:])
+    return tuple(segments)
 
 def replace_description_placeholders(description: str, blackboard: dict) -> str:
     if not description:
         return ""
-    
-    def replace_match(match):
-        full_key = match.group(1)
-        format_spec = match.group(2)
-        
+
+    parts = []
+    for segment in compile_description(description):
+        if type(segment) is str:
+            parts.append(segment)
+            continue
+        full_key, original, kind, format_spec = segment
         value = blackboard.get(full_key) # Direct lookup in the flat blackboard
 
         if value is None:
-            # If key not found, return original placeholder
-            return match.group(0)
-
-        # Apply formatting
-        if format_spec:
+            # If key not found, keep the original placeholder
+            parts.append(original)
+        elif kind == PLAIN:
+            # Default formatting: remove trailing .0 for floats
+            if isinstance(value, float) and value.is_integer():
+                parts.append(str(int(value)))
+            else:
+                parts.append(str(value))
+        else:
             try:
-                if '%' in format_spec:
-                    precision_match = re.search(r'\.(\d+)', format_spec)
-                    precision = int(precision_match.group(1)) if precision_match else 0
-                    
-                    percent_val = value * 100
-                    return f"{percent_val:.{precision}f}%"
+                if kind == PERCENT:
+                    parts.append(format(value * 100, format_spec) + "%")
                 else:
-                    return f"{value:{format_spec}}"
+                    parts.append(format(value, format_spec))
             except ValueError:
-                return match.group(0) # Fallback if formatting fails
-        else:
-            # Default formatting: remove trailing .0 for floats
-            if isinstance(value, float) and value.is_integer():
-                return str(int(value))
-            return str(value)
-
-    # Correct regex to match single braces like {key} or {key:fmt}
-    processed_description = re.sub(r'\{([a-zA-Z0-9_\.@\[\]]+)(?::([^{}]+))?}', replace_match, description)
-    return processed_description
+                parts.append(original) # Fallback if formatting fails
+    return "".join(parts)
 
 def parse_handbook_info(story_text: str):
     gender_match = re.search(r"【性别】(.*?)\n", story_text)
@@ -0,0 +1,25 @@
+import logging
+import os
+import time
+
+# This process builds the data for DATA_MODE=reader API workers
+os.environ.setdefault("DATA_MODE", "builder")
+
+from app.config import TRACE_STARTUP_MEMORY
+from app.core.refresher import refresher
+
+def main():
+    # Shows the per-stage load measurements
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    print("Data builder started. Publishing the shared snapshot for reader workers.")
+    refresher.reload(trace_memory=TRACE_STARTUP_MEMORY)
+    refresher.start()
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        refresher.stop()
+        print("\nData builder stopped.")
+
+if __name__ == "__main__":
+    main()
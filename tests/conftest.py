@@ -0,0 +1,195 @@
+import json
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+from app.config import CACHE_DIR
+from app.core import loader
+from app.core.logic import BASE_STAT_KEYS
+from app.db.repository import db
+
+# Calculation settings checked against each other, out-of-range values included
+ELITES = (None, -1, 0, 1, 2, 3)
+LEVELS = (None, -5, 0, 1, 2, 29, 30, 45, 55, 89, 90, 91)
+TRUSTS = (-3, 0, 12, 25, 37, 50, 100, 150)
+POTENTIALS = (-1, 0, 1, 5, 7)
+
+def frame_data(rnd: random.Random, scale: float, drop_keys: int = 0) -> dict:
+    data = {
+        "maxHp": int(800 * scale) + rnd.randint(0, 400), "atk": int(200 * scale) + rnd.randint(0, 100),
+        "def": int(80 * scale) + rnd.randint(0, 50), "magicResistance": rnd.choice([0.0, 5.0, 12.5]),
+        "cost": rnd.randint(7, 30), "blockCnt": rnd.randint(0, 3), "moveSpeed": 1.0,
+        "attackSpeed": 100.0, "baseAttackTime": rnd.choice([1.0, 1.05, 1.6, 2.85]),
+        "respawnTime": rnd.choice([18, 35, 70]), "stunImmune": False,
+    }
+    for key in rnd.sample(BASE_STAT_KEYS, drop_keys):
+        del data[key]
+    return data
+
+def make_stat_source(rnd: random.Random, index: int, irregular: bool = True) -> dict:
+    """
+    The attribute data of a character_table entry, in the shapes the attribute code has to handle.
+    Without `irregular`, every operator has phases with complete, ordered keyframes, as the loader expects.
+    """
+    phases = []
+    phase_count = rnd.choice([0, 1, 2, 3]) if index % 9 else 0
+    if not irregular:
+        phase_count = max(phase_count, 1)
+    for elite in range(phase_count):
+        max_level = rnd.choice([30, 40, 50, 70, 80, 90])
+        frames = [{"level": 1, "data": frame_data(rnd, 1 + elite)}, {"level": max_level, "data": frame_data(rnd, 2 + elite)}]
+        if index % 5 == 0:
+            frames = frames[:1]
+        elif index % 7 == 0:
+            frames.insert(1, {"level": max_level // 2, "data": frame_data(rnd, 1.5 + elite)})
+        if irregular and index % 11 == 0:
+            # Keys missing from either keyframe
+            frames[0]["data"] = frame_data(rnd, 1 + elite, drop_keys=2)
+            frames[-1]["data"] = frame_data(rnd, 2 + elite, drop_keys=1)
+        if irregular and index % 13 == 0 and len(frames) > 1:
+            # Out of order keyframes cannot be vectorized
+            frames.reverse()
+        phases.append({"maxLevel": max_level, "attributesKeyFrames": frames})
+
+    favor = []
+    if index % 4:
+        favor = [{"level": 0, "data": {"maxHp": 0, "atk": 0, "def": 0, "magicResistance": 0.0}},
+                 {"level": 50, "data": {"maxHp": rnd.choice([0, 200, 300]), "atk": rnd.choice([0, 40, 75]),
+                                        "def": rnd.choice([0, 25]), "magicResistance": rnd.choice([0.0, 5.0])}}]
+        if index % 3 == 0:
+            favor.insert(1, {"level": 25, "data": {"maxHp": 77, "atk": 13}})
+
+    potentials = []
+    for _ in range(5 if index % 6 else rnd.randint(0, 3)):
+        if rnd.random() < 0.25:
+            potentials.append({"type": "CUSTOM", "buff": None})
+        else:
+            modifiers = [{"attributeType": rnd.choice([0, 1, 2, 3, 7, 21, 22, 23, 9]), "value": rnd.choice([1.0, 2.0, 25.0, -4.0, 0.5 if irregular else 5.0])}
+                         for _ in range(rnd.choice([1, 1, 2]))]
+            potentials.append({"type": "BUFF", "buff": {"attributes": {"attributeModifiers": modifiers}}})
+
+    return {"charId": f"char_{index:03d}_test", "phases": phases, "favorKeyFrames": favor, "potentialRanks": potentials}
+
+@pytest.fixture(scope="session")
+def stat_sources():
+    rnd = random.Random(7)
+    return [make_stat_source(rnd, index) for index in range(80)]
+
+PROFESSIONS = ["WARRIOR", "SNIPER", "TANK", "MEDIC", "SUPPORT", "CASTER", "SPECIAL", "PIONEER"]
+NATIONS = ["rhodes", "kazimierz", "laterano", "victoria", "yan", None]
+TAGS = ["输出", "治疗", "防护", "控场", "削弱", "支援", "快速复活", "群攻", "Robot", "Nuker"]
+NAME_CHARACTERS = "阿米娅能天使推进之王银灰艾雅法拉星熊塞雷娅煌斯卡蒂陈黑夜莺伊芙利特闪灵安洁莉娜"
+LATIN_NAMES = ["W", "Mon3tr", "THRM-EX", "Lancet-2", "Castle-3", "Logos"]
+SKILL_DESCRIPTIONS = [
+    "攻击力提升至<@ba.vup>{atk_scale:0%}</>，持续{duration}秒",
+    "攻击时有{attack@prob:0.0%}的概率造成<@ba.kw>眩晕</>",
+    "接下来{cnt}次攻击造成{atk_scale:0.0%}伤害",
+    None,
+]
+
+def write_game_data(directory: Path, count: int = 240, seed: int = 7):
+    """Writes a synthetic set of the REQUIRED_FILES tables, shaped like the upstream game data."""
+    rnd = random.Random(seed)
+    sub_professions = {profession: [f"{profession.lower()[:4]}sub{i}" for i in range(3)] for profession in PROFESSIONS}
+    characters, handbooks, skills, modules, battle_equips = {}, {}, {}, {}, {}
+    for i in range(count):
+        char_id = f"char_{i:03d}_op{i}"
+        profession = rnd.choice(PROFESSIONS)
+        rarity = rnd.randint(1, 6)
+        if i % 17 == 0:
+            name = rnd.choice(LATIN_NAMES) + str(i)
+        else:
+            name = "".join(rnd.choice(NAME_CHARACTERS) for _ in range(rnd.randint(1, 4)))
+        stats = make_stat_source(rnd, i, irregular=False)
+
+        skill_refs = []
+        for s in range(min(3, rarity - 2) if rarity > 2 else 1):
+            skill_id = f"skchr_op{i}_{s + 1}"
+            token_id = None
+            if i % 9 == 0 and s == 0:
+                token_id = f"token_{i:03d}_summon"
+                characters[token_id] = {"name": rnd.choice(["小龙", "浮游炮", "Shield", "召唤物"]) + str(i % 7),
+                                        "description": "召唤<@ba.kw>物</>", "profession": "TOKEN", "phases": []}
+            skill_refs.append({"skillId": skill_id, "overrideTokenKey": token_id})
+            levels = []
+            for level in range(7):
+                blackboard = [{"key": "atk_scale", "value": round(1.1 + 0.1 * level, 2)},
+                              {"key": "duration", "value": rnd.choice([10.0, 15.0, 0.0])},
+                              {"key": "attack@prob", "value": round(0.1 + 0.01 * level, 3)},
+                              {"key": "cnt", "value": float(level + 1)}]
+                levels.append({"name": f"技能{s + 1}", "description": rnd.choice(SKILL_DESCRIPTIONS), "skillType": "MANUAL",
+                               "spData": {"spType": 1, "spCost": 30 - level, "initSp": 10 + level}, "duration": 0.0,
+                               "blackboard": blackboard})
+            skills[skill_id] = {"skillId": skill_id, "levels": levels}
+
+        characters[char_id] = {
+            "name": name, "description": f"对敌人造成<@ba.kw>{profession}</>伤害" if i % 8 else None,
+            "canUseGeneralPotentialItem": rarity < 6, "canUseActivityPotentialItem": False,
+            "potentialItemId": f"p_char_{i}", "groupId": rnd.choice([None, "group_a"]), "teamId": None,
+            "nationId": rnd.choice(NATIONS), "displayNumber": f"R{i:03d}" if i % 41 else None, "appellation": f"Op{i}",
+            "position": "MELEE" if profession in ("WARRIOR", "TANK", "PIONEER", "SPECIAL") else "RANGED",
+            "tagList": rnd.sample(TAGS, rnd.randint(0, 3)) if i % 43 else None,
+            "itemObtainApproach": rnd.choice(["招募寻访", "主线剧情", "活动获得", None]),
+            "isNotObtainable": False, "isSpChar": False, "maxPotentialLevel": len(stats["potentialRanks"]),
+            "rarity": f"TIER_{rarity}", "profession": profession, "subProfessionId": rnd.choice(sub_professions[profession]),
+            "phases": stats["phases"], "skills": skill_refs, "talents": [],
+            "potentialRanks": [dict(rank, description=f"潜能{rank['type']}") for rank in stats["potentialRanks"]],
+            "favorKeyFrames": stats["favorKeyFrames"],
+        }
+        if i % 7 != 2:
+            story = (f"【代号】{name}\n【性别】{rnd.choice(['男', '女'])}\n【出身地】{rnd.choice(['维多利亚', '炎', 'Unknown'])}\n"
+                     f"【种族】{rnd.choice(['卡特斯', '黎博利', 'Feline'])}\n")
+            handbooks[char_id] = {"charID": char_id, "storyTextAudio": [{"stories": [{"storyText": story}]}]}
+
+        if rarity >= 4 and i % 3:
+            module_id = f"uniequip_{i:03d}_1"
+            modules[module_id] = {"uniEquipId": module_id, "uniEquipName": "模组", "uniEquipDesc": "模组描述",
+                                  "typeIcon": "typ-1", "typeName1": "XYZ", "typeName2": "Y", "charId": char_id}
+            battle_equips[module_id] = {"phases": [{
+                "equipLevel": level,
+                "parts": [{"target": "TRAIT", "overrideTraitDataBundle": {"candidates": [
+                    {"additionalDescription": "攻击力提升{atk:0%}", "overrideDescripton": None,
+                     "blackboard": [{"key": "atk", "value": 0.05 * level}]}]}}],
+                "attributeBlackboard": [{"key": "atk", "value": 20.0 * level}],
+            } for level in (1, 2, 3)]}
+
+    tables = {
+        "character_table.json": characters,
+        "handbook_info_table.json": {"handbookDict": handbooks},
+        "skill_table.json": skills,
+        "favor_table.json": {"maxFavor": 200},
+        "uniequip_table.json": {"equipDict": modules, "subProfDict": {
+            sub: {"subProfessionId": sub, "subProfessionName": sub + "名"} for subs in sub_professions.values() for sub in subs}},
+        "battle_equip_table.json": battle_equips,
+        "handbook_team_table.json": {nation: {"powerName": nation + "势力"} for nation in NATIONS if nation},
+    }
+    directory.mkdir(parents=True, exist_ok=True)
+    for filename, table in tables.items():
+        (directory / filename).write_text(json.dumps(table, ensure_ascii=False), encoding="utf-8")
+
+@pytest.fixture(scope="session")
+def roster(tmp_path_factory):
+    """The synthetic game data loaded and published to `db`; the cache lives in a temporary working directory."""
+    workdir = tmp_path_factory.mktemp("roster")
+    write_game_data(workdir / CACHE_DIR)
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        assert loader.load_data(skip_download=True)
+        yield db.snapshot()
+    finally:
+        os.chdir(previous_cwd)
+
+@pytest.fixture
+def client(roster):
+    """A client of the app serving the synthetic roster; the lifespan (initial load, refresher) is not run."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+def reload_roster():
+    """Publishes the synthetic roster again as a new data version, like a reload that found changes."""
+    assert loader.load_data(skip_download=True)
+    return db.snapshot()
@@ -0,0 +1,47 @@
+import itertools
+import random
+
+import pytest
+
+from app.core.batch import AttributeBatchEngine
+from app.core.logic import calculate_attributes
+from conftest import ELITES, LEVELS, POTENTIALS, TRUSTS
+
+@pytest.fixture(scope="module")
+def engine(stat_sources):
+    engine = AttributeBatchEngine(stat_sources)
+    # Both the vectorized and the per-operator fallback path are exercised
+    assert engine.scalar_only.any() and not engine.scalar_only.all()
+    return engine
+
+def scalar(op: dict, *params):
+    attributes = calculate_attributes(op, *params)
+    return None if attributes is None else attributes.model_dump(by_alias=True)
+
+def assert_same(batch, expected):
+    assert batch == expected
+    if expected is not None:
+        # Same key order and the same int/float types, so the serialized JSON is identical
+        assert list(batch) == list(expected)
+        assert [type(value) for value in batch.values()] == [type(value) for value in expected.values()]
+
+@pytest.mark.parametrize("elite", ELITES)
+def test_batch_matches_scalar_calculation(stat_sources, engine, elite):
+    for level, trust, potential in itertools.product(LEVELS, TRUSTS, POTENTIALS):
+        params = (elite, level, trust, potential)
+        for op, batch in zip(stat_sources, engine.calculate(stat_sources, *params)):
+            assert_same(batch, scalar(op, *params))
+
+def test_batch_with_settings_per_operator(stat_sources, engine):
+    rnd = random.Random(11)
+    params = [(rnd.choice(ELITES), rnd.choice(LEVELS), rnd.choice(TRUSTS), rnd.choice(POTENTIALS)) for _ in stat_sources]
+    for op, op_params, batch in zip(stat_sources, params, engine.calculate_each(stat_sources, params)):
+        assert_same(batch, scalar(op, *op_params))
+
+def test_batch_of_a_subset_in_any_order(stat_sources, engine):
+    subset = stat_sources[::-3]
+    for op, batch in zip(subset, engine.calculate(subset, 1, 40, 50, 2)):
+        assert_same(batch, scalar(op, 1, 40, 50, 2))
+
+def test_empty_batch(engine):
+    assert engine.calculate([]) == []
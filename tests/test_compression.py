@@ -0,0 +1,74 @@
+import pytest
+
+from app.api.compression import ENCODINGS, negotiate_encoding
+
+BEST = ENCODINGS[0]
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("gzip", "gzip"),
+    ("GZIP", "gzip"),
+    ("deflate", None),
+    ("gzip;q=0", None),
+    ("gzip;q=0.0, deflate", None),
+    ("gzip;q=0.5, identity;q=0", "gzip"),
+    ("gzip, identity;q=0", "gzip"),
+    # Nothing acceptable but identity refused: the body is still sent uncompressed
+    ("identity;q=0", None),
+    ("deflate, identity;q=0", None),
+    ("*", BEST),
+    ("*;q=0", None),
+    ("*, gzip;q=0", next((encoding for encoding in ENCODINGS if encoding != "gzip"), None)),
+    ("gzip;q=0.5, identity;q=0.8", None),
+    ("gzip;q=0.8, identity;q=0.8", "gzip"),
+    ("gzip, identity", "gzip"),
+    ("gzip;q=abc", None),
+    (" gzip ; q=0.3 ,", "gzip"),
+])
+def test_negotiation(header, expected):
+    assert negotiate_encoding(header) == expected
+
+def test_higher_q_value_wins():
+    for encoding in ENCODINGS:
+        others = ", ".join(f"{other};q=0.5" for other in ENCODINGS if other != encoding)
+        assert negotiate_encoding(f"{others}, {encoding};q=0.9".strip(", ")) == encoding
+
+# Large enough to be compressed
+URL = "/api/operators/basic"
+
+def test_compressed_variant_has_its_own_etag(client):
+    plain = client.get(URL, headers={"Accept-Encoding": "identity"})
+    compressed = client.get(URL, headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert plain.headers["Vary"] == compressed.headers["Vary"] == "Accept-Encoding"
+    assert compressed.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+    # httpx decodes the body; it must be the identity body
+    assert compressed.content == plain.content
+
+def test_repeated_compressed_responses_are_identical(client):
+    first = client.get(URL, headers={"Accept-Encoding": "gzip"})
+    second = client.get(URL, headers={"Accept-Encoding": "gzip"})
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert first.content == second.content
+
+def test_each_etag_validates_only_its_own_representation(client):
+    plain_etag = client.get(URL, headers={"Accept-Encoding": "identity"}).headers["ETag"]
+    gzip_etag = client.get(URL, headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+
+    not_modified = client.get(URL, headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+    assert not_modified.status_code == 304
+    # A 304 must not claim an encoding: caches copy its headers onto the response they stored
+    assert "Content-Encoding" not in not_modified.headers
+    assert not_modified.headers["Vary"] == "Accept-Encoding"
+
+    assert client.get(URL, headers={"Accept-Encoding": "gzip", "If-None-Match": plain_etag}).status_code == 200
+    assert client.get(URL, headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag}).status_code == 200
+    assert client.get(URL, headers={"Accept-Encoding": "identity", "If-None-Match": plain_etag}).status_code == 304
+
+def test_small_responses_are_not_compressed(client):
+    response = client.get("/api/operators/basic?char_id=missing", headers={"Accept-Encoding": "gzip"})
+    assert response.content == b"[]"
+    assert "Content-Encoding" not in response.headers
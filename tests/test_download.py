@@ -0,0 +1,128 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import REQUIRED_FILES, VALIDATORS_FILE
+from app.core import loader
+
+class FakeRemote:
+    """The remote data source: serves `files` with ETags, answers 304 to a matching If-None-Match."""
+    def __init__(self):
+        self.files = {filename: json.dumps({"file": filename, "revision": 1}).encode("utf-8") for filename in REQUIRED_FILES}
+        self.failing = set()
+        self.responses = []
+        self._lock = threading.Lock()
+
+    def etag(self, filename: str) -> str:
+        return '"' + hashlib.sha1(self.files[filename]).hexdigest() + '"'
+
+    def handler(self):
+        remote = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                filename = self.path.rsplit("/", 1)[-1]
+                if filename in remote.failing or filename not in remote.files:
+                    status, body = 500, b"upstream error"
+                elif self.headers.get("If-None-Match") == remote.etag(filename):
+                    status, body = 304, b""
+                else:
+                    status, body = 200, remote.files[filename]
+                with remote._lock:
+                    remote.responses.append((filename, status))
+                self.send_response(status)
+                if status != 500:
+                    self.send_header("ETag", remote.etag(filename))
+                if status != 304:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def statuses(self) -> dict:
+        with self._lock:
+            statuses = dict(self.responses)
+            self.responses.clear()
+        return statuses
+
+@pytest.fixture
+def remote():
+    remote = FakeRemote()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), remote.handler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    remote.base_url = f"http://127.0.0.1:{server.server_port}/excel/"
+    yield remote
+    server.shutdown()
+    server.server_close()
+
+def cache_contents(cache_dir) -> dict:
+    return {path.name: path.read_bytes() for path in sorted(cache_dir.iterdir())}
+
+def test_fresh_download_fills_the_cache(remote, tmp_path):
+    cache_dir = tmp_path / "cache"
+    assert loader.update_cache_if_needed(remote.base_url, cache_dir) is True
+
+    assert remote.statuses() == {filename: 200 for filename in REQUIRED_FILES}
+    for filename in REQUIRED_FILES:
+        assert (cache_dir / filename).read_bytes() == remote.files[filename]
+    validators = json.loads((cache_dir / VALIDATORS_FILE).read_text(encoding="utf-8"))
+    assert {filename: entry["etag"] for filename, entry in validators.items()} == {filename: remote.etag(filename) for filename in REQUIRED_FILES}
+    assert not (cache_dir / ".download").exists()
+    assert loader.last_download_error is None
+
+def test_refresh_with_every_file_unchanged_is_all_304(remote, tmp_path):
+    cache_dir = tmp_path / "cache"
+    loader.update_cache_if_needed(remote.base_url, cache_dir)
+    remote.statuses()
+    before = cache_contents(cache_dir)
+
+    assert loader.update_cache_if_needed(remote.base_url, cache_dir, force=True) is False
+
+    assert remote.statuses() == {filename: 304 for filename in REQUIRED_FILES}
+    assert cache_contents(cache_dir) == before
+    assert loader.last_download_bytes == {}
+    assert loader.last_download_error is None
+
+def test_refresh_replaces_only_the_changed_file(remote, tmp_path):
+    cache_dir = tmp_path / "cache"
+    loader.update_cache_if_needed(remote.base_url, cache_dir)
+    remote.statuses()
+    before = cache_contents(cache_dir)
+    changed = REQUIRED_FILES[0]
+    remote.files[changed] = json.dumps({"file": changed, "revision": 2}).encode("utf-8")
+
+    assert loader.download_files(remote.base_url, cache_dir) is True
+
+    statuses = remote.statuses()
+    assert statuses.pop(changed) == 200
+    assert set(statuses.values()) == {304}
+    after = cache_contents(cache_dir)
+    assert after[changed] == remote.files[changed]
+    assert {name: body for name, body in after.items() if name not in (changed, VALIDATORS_FILE)} == \
+        {name: body for name, body in before.items() if name not in (changed, VALIDATORS_FILE)}
+    assert json.loads(after[VALIDATORS_FILE])[changed]["etag"] == remote.etag(changed)
+    assert loader.last_download_bytes == {changed: len(remote.files[changed])}
+
+def test_failed_file_leaves_the_cache_untouched(remote, tmp_path):
+    cache_dir = tmp_path / "cache"
+    loader.update_cache_if_needed(remote.base_url, cache_dir)
+    before = cache_contents(cache_dir)
+    # One file changed upstream, but another one fails: nothing may be committed
+    changed, failing = REQUIRED_FILES[0], REQUIRED_FILES[1]
+    remote.files[changed] = json.dumps({"file": changed, "revision": 2}).encode("utf-8")
+    remote.failing.add(failing)
+
+    assert loader.download_files(remote.base_url, cache_dir) is False
+
+    assert cache_contents(cache_dir) == before
+    assert not (cache_dir / ".download").exists()
+    assert failing in loader.last_download_error
+    assert changed not in loader.last_download_error
@@ -0,0 +1,121 @@
+import random
+
+import pytest
+
+from app.config import POSITION_MAP, PROFESSION_MAP
+
+def linear_filter(snapshot, char_id=None, name=None, profession=None, sub_profession=None, rarity=None, position=None,
+                  tags=None, nation=None, gender=None, birth_place=None, race=None, obtain_approach=None):
+    """The full scan the inverted indexes replaced: every filter compared against every operator."""
+    def any_of(values):
+        return values if isinstance(values, list) else [values]
+
+    def equals_any(op, field, values, mapping=None):
+        value = op.get(field)
+        if not value:
+            return False
+        return any(value.lower() == (mapping or {}).get(wanted, wanted).lower() for wanted in any_of(values))
+
+    def name_matches(op):
+        name_lower = name.lower()
+        if op.get("name") and name_lower in op["name"].lower():
+            return True
+        return any(token.name and name_lower in token.name.lower() for token in op.get("tokens") or [])
+
+    checks = []
+    if char_id:
+        checks.append(lambda op: op.get("charId") == char_id)
+    if name:
+        checks.append(name_matches)
+    if profession:
+        checks.append(lambda op: equals_any(op, "profession", profession, PROFESSION_MAP))
+    if sub_profession:
+        checks.append(lambda op: equals_any(op, "subProfessionId", sub_profession, snapshot.subpro_map))
+    if rarity:
+        checks.append(lambda op: op.get("rarity") in [f"TIER_{r}" for r in any_of(rarity)])
+    if position:
+        checks.append(lambda op: equals_any(op, "position", position, POSITION_MAP))
+    if tags:
+        checks.append(lambda op: bool(op.get("tagList")) and all(tag.lower() in [t.lower() for t in op["tagList"]] for tag in tags))
+    if nation:
+        checks.append(lambda op: equals_any(op, "nationId", nation, snapshot.nation_map))
+    if gender:
+        checks.append(lambda op: equals_any(op, "gender", gender))
+    if birth_place:
+        checks.append(lambda op: equals_any(op, "birth_place", birth_place))
+    if race:
+        checks.append(lambda op: equals_any(op, "race", race))
+    if obtain_approach:
+        checks.append(lambda op: equals_any(op, "itemObtainApproach", obtain_approach))
+    return [op for op in snapshot.operators if all(check(op) for check in checks)]
+
+def assert_same_operators(snapshot, **filters):
+    expected = linear_filter(snapshot, **filters)
+    # The very same records, in data order
+    assert [op["charId"] for op in snapshot.filter_operators(**filters)] == [op["charId"] for op in expected], filters
+    return expected
+
+@pytest.mark.parametrize("filters", [
+    {"profession": "MEDIC"},
+    {"profession": "medic"},
+    {"profession": "医疗"},
+    {"profession": ["近卫", "sniper"]},
+    {"position": "近战位"},
+    {"position": "ranged"},
+    {"sub_profession": "WARRSUB1"},
+    {"sub_profession": "warrsub1名"},
+    {"nation": "rhodes势力"},
+    {"nation": ["YAN", "victoria"]},
+    {"gender": "女", "race": "feline"},
+    {"birth_place": "unknown"},
+    {"obtain_approach": "招募寻访", "rarity": [5, 6]},
+    {"rarity": 3},
+    {"tags": ["robot"]},
+    {"tags": ["输出", "NUKER"]},
+    {"tags": ["输出", "不存在"]},
+    {"char_id": "char_005_op5"},
+    {"char_id": "CHAR_005_OP5"},
+    {"profession": "nope"},
+])
+def test_indexed_filters_match_a_linear_scan(roster, filters):
+    assert_same_operators(roster, **filters)
+
+def test_case_folding_and_tag_membership_find_operators(roster):
+    # The explicit cases above must not all pass by matching nothing
+    assert assert_same_operators(roster, profession="medic")
+    assert assert_same_operators(roster, tags=["robot"])
+    assert assert_same_operators(roster, position="ranged", tags=["输出"])
+
+def test_random_filter_combinations_match_a_linear_scan(roster):
+    rnd = random.Random(1)
+    operators = roster.operators
+
+    def pick(field):
+        value = rnd.choice([op[field] for op in operators if op.get(field)])
+        return value.upper() if isinstance(value, str) and rnd.random() < 0.3 else value
+
+    for _ in range(2000):
+        filters = {}
+        if rnd.random() < 0.1:
+            filters["char_id"] = rnd.choice(operators)["charId"]
+        if rnd.random() < 0.3:
+            filters["profession"] = rnd.choice(["近卫", "狙击", "MEDIC", "caster", "nope", ["TANK", "辅助"]])
+        if rnd.random() < 0.2:
+            filters["sub_profession"] = pick("subProfessionId")
+        if rnd.random() < 0.3:
+            filters["rarity"] = rnd.choice([rnd.randint(1, 6), [rnd.randint(1, 6), rnd.randint(1, 6)]])
+        if rnd.random() < 0.2:
+            filters["position"] = rnd.choice(["近战位", "RANGED", "melee"])
+        if rnd.random() < 0.2:
+            filters["tags"] = [pick("tagList")[0]] + ([rnd.choice(["输出", "robot", "x"])] if rnd.random() < 0.3 else [])
+        if rnd.random() < 0.2:
+            filters["nation"] = rnd.choice(["rhodes", "rhodes势力", "YAN", "x"])
+        if rnd.random() < 0.2:
+            filters["gender"] = rnd.choice(["男", "女", ["男", "女"]])
+        if rnd.random() < 0.1:
+            filters["birth_place"] = pick("birth_place")
+        if rnd.random() < 0.1:
+            filters["race"] = pick("race")
+        if rnd.random() < 0.1:
+            filters["obtain_approach"] = pick("itemObtainApproach")
+        assert_same_operators(roster, **filters)
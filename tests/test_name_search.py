@@ -0,0 +1,52 @@
+import random
+
+def names(op) -> list:
+    return [op["name"]] + [token.name for token in op.get("tokens") or []]
+
+def scan(snapshot, query: str) -> list:
+    """Operators whose name or any token name contains `query`, found with a plain `in` test."""
+    query = query.lower()
+    return [op["charId"] for op in snapshot.operators if any(name and query in name.lower() for name in names(op))]
+
+def search(snapshot, query: str) -> list:
+    return [op["charId"] for op in snapshot.filter_operators(name=query)]
+
+def test_candidates_contain_every_match(roster):
+    for op in roster.operators:
+        for name in names(op):
+            for start in range(len(name)):
+                for end in range(start + 1, min(len(name), start + 4) + 1):
+                    query = name[start:end].lower()
+                    assert roster.operators.index(op) in roster.name_index.candidates(query), (name, query)
+
+def test_single_characters_match_a_scan(roster):
+    characters = {character for op in roster.operators for name in names(op) for character in name}
+    for character in sorted(characters):
+        assert search(roster, character) == scan(roster, character), character
+        assert search(roster, character.upper()) == scan(roster, character), character
+
+def test_substrings_match_a_scan(roster):
+    rnd = random.Random(3)
+    queries = set()
+    for op in roster.operators:
+        for name in names(op):
+            start = rnd.randrange(len(name))
+            queries.add(name[start:start + 2])
+            queries.add(name[start:start + rnd.randint(2, 5)])
+    # Grams present in the index that never occur next to each other, and text found nowhere
+    queries.update(["阿米能", "天使之", "lancet-2", "LANCET", "mon3", "zq", "-"])
+    for query in sorted(queries):
+        assert search(roster, query) == scan(roster, query), query
+
+def test_cjk_and_token_only_matches(roster):
+    cjk = next(op for op in roster.operators if len(op["name"]) >= 2 and not op["name"].isascii())
+    assert cjk["charId"] in search(roster, cjk["name"][:2])
+
+    owner = next(op for op in roster.operators if op.get("tokens"))
+    token_name = owner["tokens"][0].name
+    token_only = [query for query in {token_name, token_name[:2], token_name[-2:]} if query.lower() not in owner["name"].lower()]
+    assert token_only
+    for query in token_only:
+        found = search(roster, query)
+        assert owner["charId"] in found
+        assert found == scan(roster, query)
@@ -0,0 +1,23 @@
+from app.db.index import INDEXED_FIELDS
+from app.db.shared import read_shared_snapshot, write_shared_snapshot
+
+def test_mapped_postings_match_the_built_sets(roster, tmp_path):
+    path = tmp_path / "shared.bin"
+    write_shared_snapshot(roster, path, "code")
+    mapped, _ = read_shared_snapshot(path, "code")
+
+    # Built in this process: prebuilt sets. Restored from the shared snapshot: flat arrays
+    assert roster.index._postings["profession"]._sets is not None
+    assert mapped.index._postings["profession"]._sets is None
+
+    for field in INDEXED_FIELDS:
+        built = roster.index._postings[field]
+        for key in list(built._sets) + ["missing"]:
+            assert mapped.index.lookup(field, key) == roster.index.lookup(field, key), (field, key)
+
+    grams = list(roster.name_index._postings._sets)
+    for query in grams + [a + b for a, b in zip(grams, grams[1:])] + ["zz"]:
+        assert mapped.name_index.candidates(query) == roster.name_index.candidates(query), query
+
+    for query in ["a", "攻击", "技能 伤害", "zzz"]:
+        assert mapped.text_index.search(query, limit=50) == roster.text_index.search(query, limit=50), query
@@ -0,0 +1,103 @@
+import pytest
+
+from app.core.cache import ResponseCache, etag_matches, make_etag
+from app.db.repository import db
+from conftest import reload_roster
+
+def test_cache_evicts_least_recently_used_within_its_byte_budget():
+    cache = ResponseCache(max_bytes=100)
+    cache.put("a", b"a" * 40, 1)
+    cache.put("b", b"b" * 40, 1)
+    assert cache.get("a") is not None
+    cache.put("c", b"c" * 40, 1)
+
+    assert cache.peek("b") is None
+    assert cache.peek("a") is not None and cache.peek("c") is not None
+    assert cache.stats()["bytes"] == 80
+    assert cache.stats()["evictions"] == 1
+
+def test_replacing_an_entry_frees_its_bytes():
+    cache = ResponseCache(max_bytes=100)
+    cache.put("a", b"a" * 60, 1)
+    cache.put("a", b"A" * 30, 1)
+    assert cache.stats()["bytes"] == 30
+    assert cache.get("a").body == b"A" * 30
+
+def test_oversized_bodies_are_returned_but_not_kept():
+    cache = ResponseCache(max_bytes=100)
+    cache.put("small", b"s" * 10, 1)
+    entry = cache.put("huge", b"h" * 101, 1)
+    assert entry.body == b"h" * 101 and entry.etag == make_etag(entry.body, 1)
+    assert cache.peek("huge") is None
+    assert cache.peek("small") is not None
+
+def test_compressed_variants_count_against_the_budget():
+    cache = ResponseCache(max_bytes=100)
+    old = cache.put("old", b"o" * 40, 1)
+    entry = cache.put("new", b"n" * 40, 1)
+    cache.add_variant("new", entry, "gzip", b"z" * 30)
+    assert cache.peek("old") is None
+    assert cache.stats()["bytes"] == 70 and cache.stats()["compressedVariants"] == 1
+    # A variant of an entry no longer cached is kept on the entry only
+    cache.add_variant("old", old, "gzip", b"z" * 30)
+    assert cache.stats()["bytes"] == 70
+
+def test_etags_depend_on_body_and_version():
+    assert make_etag(b"body", 1) == make_etag(b"body", 1)
+    assert make_etag(b"body", 1) != make_etag(b"body", 2)
+    assert make_etag(b"body", 1) != make_etag(b"other", 1)
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ("", False),
+    ('"1-abc"', True),
+    ('W/"1-abc"', True),
+    ('"0-zzz", W/"1-abc"', True),
+    ('"0-zzz",W/"1-abc" ', True),
+    ("*", True),
+    (" * ", True),
+    ('"1-abcd"', False),
+    ('"2-abc"', False),
+    ("1-abc", False),
+])
+def test_if_none_match_evaluation(header, matches):
+    assert etag_matches(header, '"1-abc"') is matches
+
+URL = "/api/operators/basic?profession=MEDIC"
+
+def test_matching_if_none_match_answers_304(client):
+    response = client.get(URL, headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200 and response.content
+    etag = response.headers["ETag"]
+    assert response.headers["X-Data-Version"] == str(db.version)
+
+    for header in (etag, "W/" + etag, f'"0-other", {etag}', "*"):
+        not_modified = client.get(URL, headers={"Accept-Encoding": "identity", "If-None-Match": header})
+        assert not_modified.status_code == 304, header
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+
+    changed = client.get(URL, headers={"Accept-Encoding": "identity", "If-None-Match": '"0-other"'})
+    assert changed.status_code == 200 and changed.content == response.content
+
+def test_cached_and_fresh_responses_are_identical(client):
+    first = client.get(URL, headers={"Accept-Encoding": "identity"})
+    second = client.get(URL, headers={"Accept-Encoding": "identity"})
+    assert first.content == second.content and first.headers["ETag"] == second.headers["ETag"]
+    # Different parameters are cached separately
+    other = client.get("/api/operators/basic?profession=TANK", headers={"Accept-Encoding": "identity"})
+    assert other.headers["ETag"] != first.headers["ETag"]
+
+def test_etag_of_the_previous_version_no_longer_matches_after_a_reload(client):
+    before = client.get(URL, headers={"Accept-Encoding": "identity"})
+    old_etag = before.headers["ETag"]
+
+    snapshot = reload_roster()
+
+    after = client.get(URL, headers={"Accept-Encoding": "identity", "If-None-Match": old_etag})
+    assert after.status_code == 200
+    assert after.headers["X-Data-Version"] == str(snapshot.version) != before.headers["X-Data-Version"]
+    assert after.headers["ETag"] != old_etag
+    # Same data, so the same body, under the new version's ETag
+    assert after.content == before.content
+    assert client.get(URL, headers={"Accept-Encoding": "identity", "If-None-Match": after.headers["ETag"]}).status_code == 304
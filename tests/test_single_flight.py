@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from app.core.cache import SingleFlight
+
+CALLERS = 8
+
+def run_concurrently(flight: SingleFlight, key, compute):
+    """Calls flight.do(key, compute) from CALLERS threads at once; returns each call's result or exception."""
+    outcomes = [None] * CALLERS
+
+    def call(i):
+        try:
+            outcomes[i] = ("result", flight.do(key, compute))
+        except Exception as e:
+            outcomes[i] = ("error", e)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert not any(thread.is_alive() for thread in threads)
+    return outcomes
+
+def blocking(release: threading.Event, calls: list, outcome):
+    def compute():
+        calls.append(threading.current_thread().name)
+        assert release.wait(timeout=10)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    return compute
+
+def release_when_all_waiting(flight: SingleFlight, release: threading.Event):
+    # Lets the computation finish only once every other caller is waiting for it
+    def watch():
+        deadline = time.monotonic() + 10
+        while flight.stats()["coalesced"] < CALLERS - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+    threading.Thread(target=watch, daemon=True).start()
+
+def test_concurrent_callers_share_one_execution():
+    flight, release, calls = SingleFlight(), threading.Event(), []
+    result = object()
+    release_when_all_waiting(flight, release)
+
+    outcomes = run_concurrently(flight, ("op", 1), blocking(release, calls, result))
+
+    assert len(calls) == 1
+    assert all(kind == "result" and value is result for kind, value in outcomes)
+    assert flight.stats() == {"executions": 1, "coalesced": CALLERS - 1, "inFlight": 0}
+
+def test_an_error_reaches_every_waiter():
+    flight, release, calls = SingleFlight(), threading.Event(), []
+    error = ValueError("build failed")
+    release_when_all_waiting(flight, release)
+
+    outcomes = run_concurrently(flight, ("op", 1), blocking(release, calls, error))
+
+    assert len(calls) == 1
+    assert all(kind == "error" and value is error for kind, value in outcomes)
+    assert flight.stats()["inFlight"] == 0
+
+def test_a_finished_flight_is_not_reused():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    with pytest.raises(KeyError):
+        flight.do("key", lambda: {}["missing"])
+    assert flight.do("key", lambda: 3) == 3
+    assert flight.stats() == {"executions": 4, "coalesced": 0, "inFlight": 0}
+
+def test_different_keys_run_separately():
+    flight, release = SingleFlight(), threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        assert release.wait(timeout=10)
+        return "slow"
+
+    thread = threading.Thread(target=lambda: flight.do("a", slow))
+    thread.start()
+    assert started.wait(timeout=10)
+    # Not coalesced into the running flight of "a"
+    assert flight.do("b", lambda: "fast") == "fast"
+    release.set()
+    thread.join(timeout=10)
+    assert flight.stats()["coalesced"] == 0
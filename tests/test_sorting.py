@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from app.api.endpoints.operators import ATTRIBUTE_RANGE_PARAMS
+from app.db.index import ATTRIBUTE_SORT_FIELDS, RANGE_FIELDS, SORT_FIELDS
+from app.db.repository import db
+
+FIELDS = "charId,name,rarity,displayNumber"
+
+def reference_sort(operators: list, keys: list, values: dict) -> list:
+    """Stable multi-key sort, missing values last in either direction, built from one pass per key."""
+    ordered = list(operators)
+    for field, descending in reversed(keys):
+        present = [op for op in ordered if values[field](op) is not None]
+        missing = [op for op in ordered if values[field](op) is None]
+        ordered = sorted(present, key=values[field], reverse=descending) + missing
+    return ordered
+
+def value_getters(snapshot) -> dict:
+    attributes = dict(zip((op["charId"] for op in snapshot.operators), snapshot.attribute_engine.calculate(snapshot.operators)))
+    getters = {field: (lambda op, field=field: op.get(field)) for field in SORT_FIELDS}
+    for field in ATTRIBUTE_SORT_FIELDS:
+        getters[field] = lambda op, field=field: attributes[op["charId"]][field] if attributes[op["charId"]] else None
+    return getters
+
+def char_ids(response) -> list:
+    assert response.status_code == 200, response.text
+    return [row["charId"] for row in response.json()]
+
+@pytest.mark.parametrize("sort", ["-", "+", "-,", "rarity,-", ",-,", " - "])
+def test_bare_signs_are_ignored(client, sort):
+    expected = char_ids(client.get("/api/operators", params={"fields": FIELDS, "sort": sort.replace("-", "").replace("+", "").strip(", ") or None}))
+    assert char_ids(client.get("/api/operators", params={"fields": FIELDS, "sort": sort})) == expected
+
+def test_unknown_sort_field_is_rejected(client):
+    response = client.get("/api/operators", params={"sort": "-rarity,height"})
+    assert response.status_code == 400
+    assert "'height'" in response.json()["detail"]
+
+@pytest.mark.parametrize("sort", ["rarity", "-rarity", "-rarity,name", "displayNumber", "-displayNumber,charId", "name,-rarity", "-atk", "cost,-maxHp", "-respawnTime,rarity"])
+def test_sorted_responses_match_a_reference_sort(client, sort):
+    snapshot = db.snapshot()
+    keys = [(key.lstrip("-"), key.startswith("-")) for key in sort.split(",")]
+    expected = [op["charId"] for op in reference_sort(snapshot.operators, keys, value_getters(snapshot))]
+    assert char_ids(client.get("/api/operators", params={"fields": FIELDS, "sort": sort})) == expected
+    assert char_ids(client.get("/api/operators/basic", params={"sort": sort})) == expected
+
+@pytest.mark.parametrize("sort", [None, "-rarity", "-rarity,name", "-atk"])
+def test_pages_are_slices_of_the_full_result(client, sort):
+    full = char_ids(client.get("/api/operators", params={"fields": FIELDS, "sort": sort}))
+    for offset, limit in [(0, 1), (0, 10), (7, 10), (len(full) - 3, 10), (len(full), 5), (len(full) + 10, 5)]:
+        response = client.get("/api/operators", params={"fields": FIELDS, "sort": sort, "offset": offset, "limit": limit})
+        assert char_ids(response) == full[offset:offset + limit], (offset, limit)
+        assert response.headers["X-Total-Count"] == str(len(full))
+    assert char_ids(client.get("/api/operators", params={"fields": FIELDS, "sort": sort, "offset": 5})) == full[5:]
+
+def test_partial_selection_equals_a_full_sort_on_ties(roster):
+    # Few distinct rarities and costs, so most keys tie and data order decides
+    sort_index, operators = roster.sort_index, roster.operators
+    rnd = random.Random(5)
+    for keys in ([("rarity", False)], [("rarity", True)], [("cost", True), ("rarity", False)], [("blockCnt", False)], [("rarity", True), ("blockCnt", True)]):
+        full = sort_index.sort(operators, keys)
+        for count in [0, 1, 2, 5, 17, 50, len(operators) - 1, len(operators), len(operators) + 5]:
+            assert sort_index.sort(operators, keys, count) == full[:count], (keys, count)
+        subset = rnd.sample(operators, 60)
+        assert sort_index.sort(subset, keys, 10) == sort_index.sort(subset, keys)[:10]
+
+@pytest.mark.parametrize("field", RANGE_FIELDS)
+def test_range_filters_match_a_scan(client, field):
+    snapshot = db.snapshot()
+    values = value_getters(snapshot)[field]
+    present = sorted({values(op) for op in snapshot.operators if values(op) is not None})
+    prefix = next(prefix for prefix, ranged in ATTRIBUTE_RANGE_PARAMS.items() if ranged == field)
+    low, high = present[len(present) // 4], present[3 * len(present) // 4]
+    for bounds in [{"min": low}, {"max": high}, {"min": low, "max": high}, {"min": high, "max": low}, {"min": present[0], "max": present[0]}]:
+        params = {f"{prefix}_{side}": value for side, value in bounds.items()}
+        expected = [op["charId"] for op in snapshot.operators
+                    if values(op) is not None and bounds.get("min", values(op)) <= values(op) <= bounds.get("max", values(op))]
+        assert char_ids(client.get("/api/operators/basic", params=params)) == expected, params
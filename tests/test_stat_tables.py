@@ -0,0 +1,24 @@
+import itertools
+
+from app.core.logic import StatTable, build_stat_table, calculate_attributes
+from conftest import ELITES, LEVELS, POTENTIALS, TRUSTS
+
+def test_stat_table_matches_keyframe_interpolation(stat_sources):
+    for op in stat_sources:
+        table_op = dict(op, statTable=build_stat_table(op))
+        for params in itertools.product(ELITES, LEVELS, TRUSTS, POTENTIALS):
+            expected = calculate_attributes(op, *params)
+            attributes = calculate_attributes(table_op, *params)
+            if expected is None:
+                assert attributes is None
+                continue
+            # repr also tells 1 from 1.0, so the serialized JSON is identical too
+            assert repr(attributes) == repr(expected), (op["charId"], params)
+
+def test_operators_without_phases_have_no_table(stat_sources):
+    for op in stat_sources:
+        table = build_stat_table(op)
+        assert (table is None) == (not op["phases"])
+        if table is not None:
+            assert isinstance(table, StatTable)
+            assert table.max_levels == [phase["maxLevel"] for phase in op["phases"]]
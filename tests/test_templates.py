@@ -0,0 +1,80 @@
+import random
+import re
+
+import pytest
+
+from app.utils import clean_markup, replace_description_placeholders
+
+def reference_clean_markup(text):
+    if text is None:
+        return None
+    return re.sub(r'<[^>]*>', '', text)
+
+def reference_replace_placeholders(description, blackboard):
+    """The substitution compiled templates replaced, kept to check their output byte for byte."""
+    if not description:
+        return ""
+
+    def replace_match(match):
+        value = blackboard.get(match.group(1))
+        format_spec = match.group(2)
+        if value is None:
+            return match.group(0)
+        if format_spec:
+            try:
+                if '%' in format_spec:
+                    precision_match = re.search(r'\.(\d+)', format_spec)
+                    precision = int(precision_match.group(1)) if precision_match else 0
+                    return f"{value * 100:.{precision}f}%"
+                return f"{value:{format_spec}}"
+            except ValueError:
+                return match.group(0)
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    return re.sub(r'\{([a-zA-Z0-9_\.@\[\]]+)(?::([^{}]+))?}', replace_match, description)
+
+def outcome(function, *args):
+    try:
+        return "ok", function(*args)
+    except Exception as e:
+        return "error", type(e).__name__
+
+BLACKBOARD = {"atk_scale": 1.5, "duration": 10.0, "attack@prob": 0.15, "cnt": 3, "talent_scale": 0.333333, "def": -0.25}
+
+@pytest.mark.parametrize("description", [
+    None,
+    "",
+    "攻击力提升至<@ba.vup>{atk_scale:0%}</>，持续{duration}秒",
+    "攻击时有{attack@prob:0.0%}的概率造成<@ba.kw>眩晕</>",
+    "接下来{cnt}次攻击造成{atk_scale:0.0%}伤害 {missing_key}",
+    "提升{talent_scale:0.00}倍，{cnt:0}层，{ATK_SCALE}",
+    "<$ba.stun>眩晕</>目标{duration:0.0}秒 {atk_scale:%}",
+    "{cnt:bad}格式错误 {atk_scale:.2%} and {cnt:.1f}",
+    "防御力{def:0%}，{def:+.1f}，{{atk_scale}}，{atk_scale:}，{ atk_scale }",
+    "{atk_scale:.10%}{atk_scale:1.1.2%}{cnt:x}{cnt:>5}{duration:e}",
+])
+def test_descriptions_match_the_reference(description):
+    cleaned = clean_markup(description)
+    assert cleaned == reference_clean_markup(description)
+    assert outcome(replace_description_placeholders, cleaned, BLACKBOARD) == outcome(reference_replace_placeholders, cleaned, BLACKBOARD)
+
+def test_random_templates_match_the_reference():
+    rnd = random.Random(7)
+    keys = ["atk", "atk_scale", "a.b", "x@y", "k[0]", "dur", "missing", "Atk"]
+    specs = [None, "0%", "0.0%", ".2%", "%", ".2f", "d", "x", "abc", ">5", "+.1f", "s", "5.3%x", ".10%", "e"]
+    values = [1, 2.0, 0.5, -3, 1.25, True, False, "str", [1], 1e20, float("inf"), 0.123456789]
+    literals = ["伤害", "{", "}", "{{", "<b>", "</>", "abc", ":", "{atk", "%", " ", "\n", "{bad key}", "{a:}"]
+    for _ in range(5000):
+        parts = []
+        for _ in range(rnd.randint(0, 6)):
+            if rnd.random() < 0.5:
+                spec = rnd.choice(specs)
+                parts.append("{" + rnd.choice(keys) + (":" + spec if spec else "") + "}")
+            else:
+                parts.append(rnd.choice(literals))
+        template = "".join(parts)
+        blackboard = {key: rnd.choice(values) for key in rnd.sample(keys, rnd.randint(0, len(keys)))}
+        assert clean_markup(template) == reference_clean_markup(template)
+        assert outcome(replace_description_placeholders, template, blackboard) == outcome(reference_replace_placeholders, template, blackboard), (template, blackboard)